@@ -8,20 +8,13 @@ from pathlib import Path
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.core.parser import RelativeParser
-from src.core.converter import AutoConverter
 from src.core.flute import AutoFlute
-from src.utils.song_service import get_song_manager
+from src.utils.song_service import song_service
 from src.utils.logger import setup_logging
-from src.utils.import_coordinator import ImportCoordinator
-from src.utils.result_display import ImportResultDisplay
 from src.config import get_app_config
-from src.tools import JianpuSheetImporter, ToolsConfig
-from src.ui import InteractiveManager, SongSelector
+from src.ui import ui_factory
 from src.services import SongServiceBase
 import time
-from pathlib import Path
-import glob
 
 
 def auto_play(
@@ -110,25 +103,14 @@ def auto_play(
     else:
         print(f"🎯 策略: {final_strategy}")
 
-    # 解析和转换
-    parser = RelativeParser()
-    converter = AutoConverter()
-
-    parsed = parser.parse(song.jianpu)
-
-    if final_strategy == "manual":
-        converted = converter.convert_jianpu(
-            parsed, strategy="manual", manual_offset=strategy_param
-        )
-    elif final_strategy == "auto":
-        converted = converter.convert_jianpu(
-            parsed, strategy="auto", auto_preference=strategy_param
-        )
-    else:
-        converted = converter.convert_jianpu(parsed, strategy=final_strategy)
+    # 解析和转换（同一乐曲与策略的结果会被缓存复用）
+    parsed = service.get_parsed_jianpu(song)
+    converted, invalid_count = service.get_converted_jianpu(
+        song, final_strategy, strategy_param
+    )
 
     # 显示音域信息
-    range_info = parser.get_range_info(parsed)
+    range_info = service.parser.get_range_info(parsed)
     print(
         f"🎼 音域跨度: {range_info['span']:.1f} 半音 ({range_info['octaves']:.1f} 八度)"
     )
@@ -137,23 +119,19 @@ def auto_play(
     flute = AutoFlute(quiet=quiet)
     beat_interval = 60.0 / final_bpm
 
-    # 检查无效音符
-    invalid_count = sum(
-        1
-        for bar in converted
-        for note in bar
-        if note.physical_height is not None and not note.key_combination
-    )
-
+    # 无效音符已在转换时统计
     if invalid_count > 0:
         print(f"⚠️ 发现 {invalid_count} 个无法演奏的音符")
 
     print(f"⏱️ 准备时间: {final_ready_time} 秒")
     print("🎹 请切换到游戏窗口...")
 
+    # 按单调时钟上的绝对时间点倒计时，输出耗时不会累积到准备时间中
+    deadline = time.perf_counter()
     for i in range(final_ready_time, 0, -1):
         print(f"   {i}...")
-        time.sleep(1)
+        deadline += 1
+        time.sleep(max(0.0, deadline - time.perf_counter()))
 
     print("🎵 开始演奏!")
     try:
@@ -191,18 +169,16 @@ def analyze_song(song_name, interactive=False):
 
     print(f"🎵 分析乐曲: {song.name}")
 
-    # 解析
-    parser = RelativeParser()
-    parsed = parser.parse(song.jianpu)
+    # 解析与映射分析（同一乐曲的结果会被缓存复用）
+    analysis = service.get_song_analysis(song)
 
     # 音域分析
-    range_info = parser.get_range_info(parsed)
+    range_info = analysis["range_info"]
     print(f"🎼 音域: {range_info['min']:.1f} ~ {range_info['max']:.1f} 半音")
     print(f"📐 跨度: {range_info['span']:.1f} 半音 ({range_info['octaves']:.1f} 八度)")
 
     # 映射建议
-    converter = AutoConverter()
-    preview = converter.get_conversion_preview(parsed)
+    preview = analysis["preview"]
 
     print("\n🎯 映射策略建议:")
     for strategy, info in preview.get("suggestions", {}).items():
@@ -219,6 +195,10 @@ def import_sheet(image_paths, ai_provider=None, output_dir=None, debug=False):
     """导入简谱图片功能"""
 
     try:
+        # 导入相关模块依赖图像/AI库，仅在执行导入时加载
+        from src.utils.import_coordinator import ImportCoordinator
+        from src.utils.result_display import ImportResultDisplay
+
         # 获取配置
         config = get_app_config()
 
@@ -273,6 +253,8 @@ def import_sheet(image_paths, ai_provider=None, output_dir=None, debug=False):
 
 def check_ai_status():
     """检查AI服务状态"""
+    from src.tools import JianpuSheetImporter, ToolsConfig
+
     config = ToolsConfig()
     importer = JianpuSheetImporter(config)
     status = importer.get_provider_status()
@@ -307,40 +289,54 @@ def list_songs(interactive=False):
     service.list_all_songs_info()
 
 
+# 交互式主菜单选项（内容固定，模块加载时构建一次）
+MAIN_MENU_OPTIONS = [
+    {"key": "play", "desc": "🎵 自动演奏歌曲"},
+    {"key": "analyze", "desc": "🎼 分析歌曲"},
+    {"key": "list", "desc": "📋 列出所有歌曲"},
+    {"key": "import", "desc": "📸 从图片导入简谱"},
+    {"key": "ai-status", "desc": "🤖 检查AI服务状态"},
+]
+
+
 def interactive_main_menu():
     """交互式主菜单"""
-    ui_manager = InteractiveManager()
+    ui_manager = ui_factory.get_interactive_manager()
+
+    # 先配置日志，后台加载乐曲库的普通日志才会被过滤，不会打断菜单
+    config = get_app_config()
+    setup_logging(config.log_level)
+
+    # 用户浏览主菜单期间在后台加载乐曲库
+    song_service.prefetch_song_manager(config.songs_dir)
 
     ui_manager.show_welcome("Animal Well 笛子自动演奏 - 交互式模式")
 
-    while True:
-        options = [
-            {"key": "play", "desc": "🎵 自动演奏歌曲"},
-            {"key": "analyze", "desc": "🎼 分析歌曲"},
-            {"key": "list", "desc": "📋 列出所有歌曲"},
-            {"key": "import", "desc": "📸 从图片导入简谱"},
-            {"key": "ai-status", "desc": "🤖 检查AI服务状态"},
-        ]
+    def show_import_notice():
+        ui_manager.show_info("进入图片导入功能...")
+        # 这里可以添加交互式的导入功能
+        ui_manager.show_warning("交互式导入功能开发中，请使用命令行模式")
+
+    # 菜单选项 -> 处理函数，按选项直接查表分派
+    actions = {
+        "play": lambda: auto_play(None, interactive=True),
+        "analyze": lambda: analyze_song(None, interactive=True),
+        # 在交互式主菜单中默认使用交互式列表
+        "list": lambda: list_songs(interactive=True),
+        "import": show_import_notice,
+        "ai-status": check_ai_status,
+    }
 
-        choice = ui_manager.show_menu("主菜单", options, show_quit=True)
+    while True:
+        choice = ui_manager.show_menu("主菜单", MAIN_MENU_OPTIONS, show_quit=True)
 
         if choice is None:
             ui_manager.exit_gracefully()
 
         try:
-            if choice == "play":
-                auto_play(None, interactive=True)
-            elif choice == "analyze":
-                analyze_song(None, interactive=True)
-            elif choice == "list":
-                # 在交互式主菜单中默认使用交互式列表
-                list_songs(interactive=True)
-            elif choice == "import":
-                ui_manager.show_info("进入图片导入功能...")
-                # 这里可以添加交互式的导入功能
-                ui_manager.show_warning("交互式导入功能开发中，请使用命令行模式")
-            elif choice == "ai-status":
-                check_ai_status()
+            action = actions.get(choice)
+            if action is not None:
+                action()
         except KeyboardInterrupt:
             ui_manager.show_info("\n操作已取消")
         except Exception as e:
@@ -348,6 +344,13 @@ def interactive_main_menu():
             ui_manager.pause()
 
 
+def _add_interactive_argument(command_parser, help_text):
+    """为子命令添加通用的 --interactive/-i 参数"""
+    command_parser.add_argument(
+        "--interactive", "-i", action="store_true", help=help_text
+    )
+
+
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(description="Animal Well 笛子自动演奏")
@@ -368,9 +371,7 @@ def main():
     play_parser.add_argument(
         "--ready-time", type=int, help="准备时间（默认从配置读取）"
     )
-    play_parser.add_argument(
-        "--interactive", "-i", action="store_true", help="使用交互式模式选择歌曲"
-    )
+    _add_interactive_argument(play_parser, "使用交互式模式选择歌曲")
     play_parser.add_argument(
         "--quiet",
         action="store_true",
@@ -382,9 +383,7 @@ def main():
     analyze_parser.add_argument(
         "song", nargs="?", help="乐曲名称（可选，留空则进入交互式选择）"
     )
-    analyze_parser.add_argument(
-        "--interactive", "-i", action="store_true", help="使用交互式模式选择歌曲"
-    )
+    _add_interactive_argument(analyze_parser, "使用交互式模式选择歌曲")
 
     # import 命令
     import_parser = subparsers.add_parser("import", help="从图片导入简谱")
@@ -401,21 +400,17 @@ def main():
     import_parser.add_argument(
         "--debug", action="store_true", help="显示详细的AI响应信息"
     )
-    import_parser.add_argument(
-        "--interactive", "-i", action="store_true", help="使用交互式模式选择文件和选项"
-    )
+    _add_interactive_argument(import_parser, "使用交互式模式选择文件和选项")
 
     # ai-status 命令
-    ai_status_parser = subparsers.add_parser("ai-status", help="检查AI服务状态")
+    subparsers.add_parser("ai-status", help="检查AI服务状态")
 
     # list 命令
     list_parser = subparsers.add_parser("list", help="列出可用乐曲")
-    list_parser.add_argument(
-        "--interactive", "-i", action="store_true", help="使用交互式模式浏览和搜索歌曲"
-    )
+    _add_interactive_argument(list_parser, "使用交互式模式浏览和搜索歌曲")
 
     # interactive 命令
-    interactive_parser = subparsers.add_parser("interactive", help="进入交互式主菜单")
+    subparsers.add_parser("interactive", help="进入交互式主菜单")
 
     args = parser.parse_args()
 
@@ -433,7 +428,7 @@ def main():
     elif args.command == "import":
         if args.interactive:
             # 目前交互式导入功能开发中，显示提示信息
-            ui_manager = InteractiveManager()
+            ui_manager = ui_factory.get_interactive_manager()
             ui_manager.show_welcome()
             ui_manager.show_warning("交互式导入功能开发中")
             ui_manager.show_info("请使用命令行模式: python cli.py import [path]")
@@ -5,6 +5,7 @@ from pathlib import Path
 import json
 import os
 from ..utils.logger import get_logger
+from ..utils.file_utils import FileUtils
 
 logger = get_logger(__name__)
 
@@ -151,9 +152,15 @@ class AppConfig:
             key: 配置键名
             value: 配置值
         """
-        if section not in self.config:
-            self.config[section] = {}
-        self.config[section][key] = value
+        section_config = self.config.setdefault(section, {})
+        # 值与类型均未变化时不重复写入（True、1、1.0 彼此相等但保存结果不同）
+        if (
+            key in section_config
+            and type(section_config[key]) is type(value)
+            and section_config[key] == value
+        ):
+            return
+        section_config[key] = value
         logger.debug(f"Set config {section}.{key} = {value}")
 
     def save_config(self, file_path: Optional[Path] = None) -> None:
@@ -165,8 +172,7 @@ class AppConfig:
         save_path = file_path or self.config_file
         try:
             save_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(save_path, "w", encoding="utf-8") as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
+            FileUtils.write_json(save_path, self.config)
             logger.info(f"Saved configuration to {save_path}")
         except Exception as e:
             logger.error(f"Failed to save config to {save_path}: {e}")
@@ -1,8 +1,8 @@
 """新的音符转换器 - 使用自适应映射系统"""
 
-from typing import List, Union, Optional
+from typing import List, Union, Optional, Tuple
 from ..data.music_theory import RelativeNote, PhysicalNote, MappingStrategy
-from ..core.mapping import AdaptiveMapper, MappingOptimizer
+from ..core.mapping import AdaptiveMapper, MappingOptimizer, PRESET_STRATEGIES
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -35,6 +35,30 @@ class AutoConverter:
         Returns:
             物理音符列表
         """
+        converted_jianpu, _ = self.convert_jianpu_with_stats(
+            parsed_jianpu, strategy, manual_offset, auto_preference
+        )
+        return converted_jianpu
+
+    def convert_jianpu_with_stats(
+        self,
+        parsed_jianpu: List[List[RelativeNote]],
+        strategy: Union[str, MappingStrategy] = "optimal",
+        manual_offset: Optional[float] = None,
+        auto_preference: Optional[str] = None,
+    ) -> Tuple[List[List[PhysicalNote]], int]:
+        """
+        转换简谱到物理音高，并统计无法演奏的音符
+
+        Args:
+            parsed_jianpu: 解析后的相对音高简谱
+            strategy: 映射策略 ("optimal", "high", "low", "auto", "manual")
+            manual_offset: 手动偏移量（当strategy为"manual"时使用）
+            auto_preference: 自动策略的偏好 ("optimal", "high", "low")
+
+        Returns:
+            (物理音符列表, 有音高但无按键组合的音符数)
+        """
         logger.info(
             f"Converting jianpu with {len(parsed_jianpu)} bars using {strategy} strategy"
         )
@@ -69,16 +93,12 @@ class AutoConverter:
                 )
             else:
                 # 字符串策略转换
-                strategy_map = {
-                    "optimal": MappingStrategy.OPTIMAL,
-                    "high": MappingStrategy.HIGH,
-                    "low": MappingStrategy.LOW,
-                }
-                if strategy not in strategy_map:
+                preset = PRESET_STRATEGIES.get(strategy)
+                if preset is None:
                     raise ValueError(f"Unknown strategy: {strategy}")
 
                 physical_notes = self.mapper.map_song_to_flute(
-                    all_relative_notes, strategy_map[strategy], None
+                    all_relative_notes, preset, None
                 )
         else:
             # 直接使用MappingStrategy枚举
@@ -86,19 +106,21 @@ class AutoConverter:
                 all_relative_notes, strategy, manual_offset
             )
 
-        # 重新组织为小节结构
+        # 重新组织为小节结构，同时统计无法演奏的音符
         converted_jianpu = []
+        unplayable_count = 0
         note_index = 0
 
         for bar in parsed_jianpu:
-            converted_bar = []
-            for _ in bar:
-                converted_bar.append(physical_notes[note_index])
-                note_index += 1
+            converted_bar = physical_notes[note_index : note_index + len(bar)]
+            note_index += len(bar)
+            for note in converted_bar:
+                if note.physical_height is not None and not note.key_combination:
+                    unplayable_count += 1
             converted_jianpu.append(converted_bar)
 
         self._log_conversion_summary(converted_jianpu)
-        return converted_jianpu
+        return converted_jianpu, unplayable_count
 
     def get_conversion_preview(self, parsed_jianpu: List[List[RelativeNote]]) -> dict:
         """获取转换预览信息"""
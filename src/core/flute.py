@@ -3,7 +3,7 @@
 改进点：
 - 采用基于绝对时间轴的调度，避免顺序 sleep 导致节拍累计漂移。
 - 保留 ESC 及时停止能力，同时减少无意义的分段等待。
-- 提供可选的安静模式以减少逐音打印对时序的干扰（默认关闭以保持现有输出）。
+- 提供可选的安静模式以减少逐音/逐小节打印对时序的干扰（默认关闭以保持现有输出）。
 """
 
 import time
@@ -54,16 +54,32 @@ class AutoFlute:
     ):
         self.keyboard = keyboard or Controller()
         self.blow_key = blow_key
-        self.stop_requested = False
+        # 吹气键在整个演奏过程中不变，初始化时解析一次
+        self._blow_key_obj = self._convert_key(blow_key)
+        # 停止信号：ESC 监听线程置位，等待中的演奏线程被立即唤醒
+        self._stop_event = threading.Event()
         self.listener = None
         self.quiet = quiet
         # 等待策略参数（可根据需要微调）
-        self._long_sleep_slice = 0.05  # >50ms 使用较长 sleep 片段
+        # Windows 上 Event.wait 的超时按约15.6ms的系统时钟粒度取整，只阻塞到目标前20ms
+        self._event_guard_time = 0.02
         self._guard_time = 0.002  # 2ms 保护，避免 oversleep
         logger.info(
             f"AutoFlute initialized with blow_key={blow_key}, quiet={quiet}"
         )
 
+    @property
+    def stop_requested(self) -> bool:
+        """是否已请求停止演奏"""
+        return self._stop_event.is_set()
+
+    @stop_requested.setter
+    def stop_requested(self, value: bool) -> None:
+        if value:
+            self._stop_event.set()
+        else:
+            self._stop_event.clear()
+
     def _convert_key(self, key_str: str):
         """将字符串按键转换为pynput可用的按键对象"""
         return self.KEY_MAPPING.get(key_str, key_str)
@@ -93,29 +109,24 @@ class AutoFlute:
 
         返回 False 表示已请求停止，应中断后续演奏。
         """
+        stop_event = self._stop_event
+        remaining = target_time - perf_counter()
+
+        # 长等待：在停止信号上阻塞，请求停止时立即被唤醒，无需轮询
+        if remaining > self._event_guard_time:
+            if stop_event.wait(remaining - self._event_guard_time):
+                return False
+
+        # 最后 20ms：time.sleep 精度更高（留出 guard），最后 2ms 忙等对齐，
+        # 每一步都检查停止信号
         while True:
-            if self.stop_requested:
+            if stop_event.is_set():
                 return False
-            now = perf_counter()
-            remaining = target_time - now
+            remaining = target_time - perf_counter()
             if remaining <= 0:
                 return True
-
-            # 长等待：最多按 50ms 片段 sleep，避免过多切片误差
-            if remaining > self._long_sleep_slice + self._guard_time:
-                time.sleep(self._long_sleep_slice)
-                continue
-
-            # 短等待：留出 guard，降低 oversleep 风险
             if remaining > self._guard_time:
                 time.sleep(remaining - self._guard_time)
-                continue
-
-            # 最后 2ms 忙等对齐，确保精确到目标时间
-            while perf_counter() < target_time:
-                if self.stop_requested:
-                    return False
-            return True
 
     def _play_note_scheduled(
         self, note: PhysicalNote, beat_interval: float, start_at: float
@@ -131,7 +142,7 @@ class AutoFlute:
         if not note.key_combination:
             if not self.quiet:
                 print(f"🎵 休止符 - 等待 {blow_time:.2f}s")
-            logger.debug(f"Rest note, waiting until {end_at:.6f}")
+            logger.debug("Rest note, waiting until %.6f", end_at)
             return self._wait_until(end_at)
 
         # 打印信息（可静音）
@@ -141,47 +152,52 @@ class AutoFlute:
                 f"🎵 演奏音符: {note.notation} (高度: {note.physical_height:.1f}) - 按键: {key_display} - 时长: {blow_time:.2f}s"
             )
 
+        # 在等待起始时间之前解析按键（按下与释放共用），不占用起音时刻
+        keys = [self._convert_key(key_str) for key_str in note.key_combination]
+
         # 等待到起始时间（如已落后则立即开始）
         if not self._wait_until(start_at):
             return False
 
-        # 按下所有按键
-        for key_str in note.key_combination:
+        # 按键方法在本音符内多次调用，先取出绑定方法
+        press = self.keyboard.press
+        release = self.keyboard.release
+
+        # 按下所有按键（逐键调试日志使用惰性格式化，未启用DEBUG时不做字符串格式化）
+        for key_str, key in zip(note.key_combination, keys):
             if self.stop_requested:
                 return False
-            key = self._convert_key(key_str)
-            self.keyboard.press(key)
-            logger.debug(f"Pressed key: {key_str} -> {key}")
+            press(key)
+            logger.debug("Pressed key: %s -> %s", key_str, key)
 
         # 按下吹气键
-        blow_key = self._convert_key(self.blow_key)
-        self.keyboard.press(blow_key)
-        logger.debug(f"Started blowing; target end at {end_at:.6f}")
+        blow_key = self._blow_key_obj
+        press(blow_key)
+        logger.debug("Started blowing; target end at %.6f", end_at)
 
         # 保持直到结束时间
         if not self._wait_until(end_at):
             # 停止请求：立即释放
             try:
-                self.keyboard.release(blow_key)
+                release(blow_key)
             finally:
-                for key_str in note.key_combination:
-                    key = self._convert_key(key_str)
-                    self.keyboard.release(key)
+                for key in keys:
+                    release(key)
             return False
 
         # 正常结束：释放按键
-        self.keyboard.release(blow_key)
-        for key_str in note.key_combination:
-            key = self._convert_key(key_str)
-            self.keyboard.release(key)
-            logger.debug(f"Released key: {key_str} -> {key}")
+        release(blow_key)
+        for key_str, key in zip(note.key_combination, keys):
+            release(key)
+            logger.debug("Released key: %s -> %s", key_str, key)
 
         return True
 
     def play_song(self, bars: List[List[PhysicalNote]], beat_interval: float) -> None:
         """演奏整首乐曲（绝对时间调度，防止节拍漂移）"""
-        print(f"🎶 开始演奏乐曲 (共 {len(bars)} 小节)")
-        logger.info(f"Starting to play song with {len(bars)} bars")
+        total_bars = len(bars)
+        print(f"🎶 开始演奏乐曲 (共 {total_bars} 小节)")
+        logger.info(f"Starting to play song with {total_bars} bars")
 
         # 启动ESC键监听
         self._start_stop_listener()
@@ -194,8 +210,10 @@ class AutoFlute:
                 if self.stop_requested:
                     break
 
-                print(f"\n📊 第 {i}/{len(bars)} 小节:")
-                logger.info(f"Playing bar {i}/{len(bars)}")
+                # 安静模式下不在演奏线程上逐小节打印进度
+                if not self.quiet:
+                    print(f"\n📊 第 {i}/{total_bars} 小节:")
+                logger.info(f"Playing bar {i}/{total_bars}")
 
                 # 小节标题打印完成后，不等待，直接按照 next_start 调度
                 for note in bar:
@@ -7,7 +7,6 @@ from ..data.music_theory import (
     PhysicalNote,
     RangeInfo,
     MappingStrategy,
-    MusicNotation,
     FlutePhysical,
     RangeAnalyzer,
 )
@@ -15,6 +14,13 @@ from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 可按名称选择的预设映射策略（名称 -> 枚举），按默认尝试顺序排列
+PRESET_STRATEGIES = {
+    "optimal": MappingStrategy.OPTIMAL,
+    "high": MappingStrategy.HIGH,
+    "low": MappingStrategy.LOW,
+}
+
 
 class AdaptiveMapper:
     """自适应音域映射器"""
@@ -98,27 +104,9 @@ class AdaptiveMapper:
         )
         logger.info(f"Strategy: {strategy.value}")
 
-        if strategy == MappingStrategy.OPTIMAL:
-            # 居中策略：让乐曲音域在笛子音域中居中
-            song_center = (range_info.min_height + range_info.max_height) / 2
-            flute_center = (
-                self.flute.MIN_PHYSICAL_HEIGHT + self.flute.MAX_PHYSICAL_HEIGHT
-            ) / 2
-            offset = flute_center - song_center
-            # 将offset归到0.5的整数倍, 以适配半音, 向上半音取整
-            offset = math.ceil(offset * 2) / 2
-            logger.info(f"Optimal offset calculated: {offset:.1f} semitones")
-
-        elif strategy == MappingStrategy.HIGH:
-            # 高音策略：让最高音接近笛子最高音
-            offset = self.flute.MAX_PHYSICAL_HEIGHT - range_info.max_height
-
-        elif strategy == MappingStrategy.LOW:
-            # 低音策略：让最低音接近笛子最低音
-            offset = self.flute.MIN_PHYSICAL_HEIGHT - range_info.min_height
-
-        else:
-            offset = 0.0
+        # 按策略查表得到初始偏移计算方法，未知策略不偏移
+        calculator = self._OFFSET_CALCULATORS.get(strategy)
+        offset = calculator(self, range_info) if calculator is not None else 0.0
 
         logger.info(f"Offset calculated: {offset:.1f} semitones")
 
@@ -138,6 +126,30 @@ class AdaptiveMapper:
         logger.info(f"Final offset: {offset:.1f} semitones")
         return offset
 
+    def _optimal_offset(self, range_info: RangeInfo) -> float:
+        """居中策略：让乐曲音域在笛子音域中居中"""
+        song_center = (range_info.min_height + range_info.max_height) / 2
+        offset = self.flute.CENTER_PHYSICAL_HEIGHT - song_center
+        # 将offset归到0.5的整数倍, 以适配半音, 向上半音取整
+        offset = math.ceil(offset * 2) / 2
+        logger.info(f"Optimal offset calculated: {offset:.1f} semitones")
+        return offset
+
+    def _high_offset(self, range_info: RangeInfo) -> float:
+        """高音策略：让最高音接近笛子最高音"""
+        return self.flute.MAX_PHYSICAL_HEIGHT - range_info.max_height
+
+    def _low_offset(self, range_info: RangeInfo) -> float:
+        """低音策略：让最低音接近笛子最低音"""
+        return self.flute.MIN_PHYSICAL_HEIGHT - range_info.min_height
+
+    # 映射策略 -> 初始偏移计算方法
+    _OFFSET_CALCULATORS = {
+        MappingStrategy.OPTIMAL: _optimal_offset,
+        MappingStrategy.HIGH: _high_offset,
+        MappingStrategy.LOW: _low_offset,
+    }
+
     def _map_single_note(
         self, relative_note: RelativeNote, offset: float
     ) -> PhysicalNote:
@@ -167,14 +179,14 @@ class AdaptiveMapper:
                 invalid_notes.append((i, note))
 
         if invalid_notes:
-            error_msg = f"Found {len(invalid_notes)} unplayable notes after mapping:\n"
-            for i, note in invalid_notes[:5]:  # 只显示前5个
-                error_msg += (
-                    f"  Note {i}: {note.notation} -> {note.physical_height:.1f}\n"
-                )
+            lines = [f"Found {len(invalid_notes)} unplayable notes after mapping:"]
+            lines.extend(
+                f"  Note {i}: {note.notation} -> {note.physical_height:.1f}"
+                for i, note in invalid_notes[:5]  # 只显示前5个
+            )
             if len(invalid_notes) > 5:
-                error_msg += f"  ... and {len(invalid_notes) - 5} more"
-            raise ValueError(error_msg.strip())
+                lines.append(f"  ... and {len(invalid_notes) - 5} more")
+            raise ValueError("\n".join(lines))
 
         # 验证音域范围
         range_info = self.analyzer.analyze_physical_notes(physical_notes)
@@ -191,11 +203,7 @@ class AdaptiveMapper:
         suggestions = {}
 
         # 尝试不同策略
-        for strategy in [
-            MappingStrategy.OPTIMAL,
-            MappingStrategy.HIGH,
-            MappingStrategy.LOW,
-        ]:
+        for strategy in PRESET_STRATEGIES.values():
             try:
                 offset = self._calculate_optimal_offset(range_info, strategy)
                 mapped_min = range_info.min_height + offset
@@ -237,19 +245,25 @@ class MappingOptimizer:
         Returns:
             (物理音符列表, 使用的策略名称)
         """
-        strategies = [
-            MappingStrategy.OPTIMAL,
-            MappingStrategy.HIGH,
-            MappingStrategy.LOW,
-        ]
+        strategies = PRESET_STRATEGIES.values()
+        range_info = self.mapper.analyzer.analyze_relative_notes(relative_notes)
 
         best_mapping = None
         best_strategy = None
         best_score = float("-inf")
+        tried_offsets = set()
 
         for strategy in strategies:
+            # 不同策略可能得到相同偏移（映射结果与评分也相同），跳过重复计算
+            offset = self.mapper._calculate_optimal_offset(range_info, strategy)
+            if offset in tried_offsets:
+                continue
+            tried_offsets.add(offset)
+
             try:
-                mapping = self.mapper.map_song_to_flute(relative_notes, strategy)
+                mapping = self.mapper.map_song_to_flute(
+                    relative_notes, MappingStrategy.MANUAL, offset
+                )
                 score = self._evaluate_mapping(mapping)
 
                 if score > best_score:
@@ -279,25 +293,13 @@ class MappingOptimizer:
             (物理音符列表, 使用的策略名称)
         """
         # 策略优先级：首先尝试用户偏好，然后尝试其他策略
-        preference_map = {
-            "optimal": MappingStrategy.OPTIMAL,
-            "high": MappingStrategy.HIGH,
-            "low": MappingStrategy.LOW,
-        }
-
-        if preference not in preference_map:
+        preferred_strategy = PRESET_STRATEGIES.get(preference)
+        if preferred_strategy is None:
             # 如果偏好无效，回退到普通的最佳映射
             return self.find_best_mapping(relative_notes)
 
-        preferred_strategy = preference_map[preference]
         other_strategies = [
-            s
-            for s in [
-                MappingStrategy.OPTIMAL,
-                MappingStrategy.HIGH,
-                MappingStrategy.LOW,
-            ]
-            if s != preferred_strategy
+            s for s in PRESET_STRATEGIES.values() if s != preferred_strategy
         ]
 
         # 首先尝试偏好策略
@@ -329,10 +331,7 @@ class MappingOptimizer:
 
         # 2. 居中程度 (居中的映射通常更好)
         center = (range_info.min_height + range_info.max_height) / 2
-        flute_center = (
-            self.mapper.flute.MIN_PHYSICAL_HEIGHT
-            + self.mapper.flute.MAX_PHYSICAL_HEIGHT
-        ) / 2
+        flute_center = self.mapper.flute.CENTER_PHYSICAL_HEIGHT
         centering = 1.0 - abs(center - flute_center) / (
             self.mapper.flute.PHYSICAL_RANGE / 2
         )
@@ -111,6 +111,7 @@ class RelativeParser:
         parsed_jianpu = []
         current_major_offset = 0.0
         bar_count = 0
+        pending_range_max = None
 
         logger.info(f"Starting to parse jianpu with {len(jianpu)} elements")
 
@@ -135,7 +136,7 @@ class RelativeParser:
                     bar, parsed_bar, time_factor=2.0, major_offset=current_major_offset
                 )
 
-                # 扩展音域定义（如果需要）
+                # 统计小节音域
                 max_height = max(
                     (
                         note.relative_height
@@ -155,28 +156,32 @@ class RelativeParser:
 
                 range_span = max_height - min_height
                 if range_span > 0:
-                    self.notation.extend_range(max_height)
+                    # 记录待扩展的最高音，全部小节解析完后统一扩展一次
+                    if pending_range_max is None or max_height > pending_range_max:
+                        pending_range_max = max_height
 
                 parsed_jianpu.append(parsed_bar)
                 bar_count += 1
-                logger.debug(f"Parsed bar {bar_count} with {len(parsed_bar)} notes")
+                logger.debug("Parsed bar %d with %d notes", bar_count, len(parsed_bar))
 
             except Exception as e:
                 logger.error(f"Error parsing bar {bar_count + 1}: {e}")
                 raise
 
+        # 扩展音域定义（如果需要）
+        if pending_range_max is not None:
+            self.notation.extend_range(pending_range_max)
+
         logger.info(f"Successfully parsed {bar_count} bars to relative pitch system")
         return parsed_jianpu
 
     def get_range_info(self, parsed_jianpu: List[List[RelativeNote]]) -> dict:
         """获取解析结果的音域信息"""
-        all_notes = []
-        for bar in parsed_jianpu:
-            all_notes.extend(bar)
-
+        # 直接从各小节收集有效音高，不再额外拼接全部音符列表
         valid_heights = [
             note.relative_height
-            for note in all_notes
+            for bar in parsed_jianpu
+            for note in bar
             if note.relative_height is not None
         ]
 
@@ -109,6 +109,9 @@ class MusicNotation:
         r"^(?P<prefix>h+|l+)(?P<body>\d+(?:\.\d+)?)$"
     )
 
+    # 已定义音符的最高相对高度（延迟计算，音域表变化时更新）
+    _max_height: Optional[float] = None
+
     @classmethod
     def initialize_half_tones(cls):
         """初始化半音音符"""
@@ -125,13 +128,18 @@ class MusicNotation:
                 if half_note not in cls.RELATIVE_HEIGHTS:
                     cls.RELATIVE_HEIGHTS[half_note] = height + 0.5
 
+        # 音域表已变化，最高音需重新计算
+        cls._max_height = None
+
     @classmethod
     def get_relative_height(cls, notation: str) -> Optional[float]:
         """获取音符的相对高度"""
         if notation in cls.RELATIVE_HEIGHTS:
             return cls.RELATIVE_HEIGHTS.get(notation)
 
-        # 支持多八度前缀：hh1 / ll6 / hhh2.5 等
+        # 支持多八度前缀：hh1 / ll6 / hhh2.5 等（首字符不是 h/l 时无需正则匹配）
+        if notation[:1] not in ("h", "l"):
+            return None
         match = cls._OCTAVE_PREFIX_PATTERN.match(notation)
         if not match:
             return None
@@ -153,7 +161,11 @@ class MusicNotation:
     @classmethod
     def extend_range(cls, target_range: float):
         """根据需要扩展音域定义"""
-        current_max = max(h for h in cls.RELATIVE_HEIGHTS.values() if h is not None)
+        current_max = cls._max_height
+        if current_max is None:
+            current_max = max(h for h in cls.RELATIVE_HEIGHTS.values() if h is not None)
+            cls._max_height = current_max
+
         if target_range > current_max:
             # 自动扩展高音区
             needed = int(target_range - current_max) + 5
@@ -161,6 +173,7 @@ class MusicNotation:
                 new_height = current_max + i + 1
                 new_note = f"h{int(new_height) + 6}"  # 简化命名
                 cls.RELATIVE_HEIGHTS[new_note] = new_height
+            cls._max_height = current_max + needed
 
 
 class FlutePhysical:
@@ -170,6 +183,7 @@ class FlutePhysical:
     MIN_PHYSICAL_HEIGHT = -6.0  # 1降八度 (1 + 按1键)
     MAX_PHYSICAL_HEIGHT = 6.5  # 1+高半音 (1+ + 按3键)
     PHYSICAL_RANGE = MAX_PHYSICAL_HEIGHT - MIN_PHYSICAL_HEIGHT
+    CENTER_PHYSICAL_HEIGHT = (MIN_PHYSICAL_HEIGHT + MAX_PHYSICAL_HEIGHT) / 2
 
     # 基础按键映射 - 对应8个方向键
     BASE_KEY_MAPPING = {
@@ -183,12 +197,17 @@ class FlutePhysical:
         6: ["right", "up"],  # h1音
     }
 
+    # 完整按键映射表（首次使用时生成，之后复用）
+    _full_key_mapping: Optional[Dict[float, List[str]]] = None
+
     @classmethod
     def get_key_combination(cls, physical_height: float) -> List[str]:
-        """获取物理音高对应的按键组合"""
-        # 生成完整的按键映射
-        key_mapping = cls._generate_full_key_mapping()
-        return key_mapping.get(physical_height, [])
+        """获取物理音高对应的按键组合（返回共享列表，调用方不应修改）"""
+        # 按键映射表是不变量，只生成一次
+        if cls._full_key_mapping is None:
+            cls._full_key_mapping = cls._generate_full_key_mapping()
+        # 按键组合只读使用，直接共享映射表中的列表，不再逐音符复制
+        return cls._full_key_mapping.get(physical_height, [])
 
     @classmethod
     def _generate_full_key_mapping(cls) -> Dict[float, List[str]]:
@@ -10,6 +10,18 @@ logger = get_logger(__name__)
 class TokenValidator:
     """Token验证器 - 统一token格式验证逻辑"""
 
+    # 各音符字符串格式合并为一个分组正则，一次匹配即可完成校验
+    _NOTE_STRING_PATTERN = re.compile(
+        r"^(?:"
+        r"\d+\.\d+"  # 浮点数音符（半音）
+        r"|(?:h+|l+)\d+"  # 低音(l)或高音(h)，支持多八度前缀
+        r"|(?:h+|l+)\d+\.\d+"  # 低音/高音的浮点数
+        r"|\d+d"  # 带d的音符
+        r"|\d+\.\d+d"  # 带d的浮点数音符
+        r"|[\d\. ()lh-]+"  # 复合格式（空格、括号等，包含小数点）
+        r")$"
+    )
+
     @staticmethod
     def is_valid_basic_token(token: str) -> bool:
         """
@@ -38,18 +50,9 @@ class TokenValidator:
         except ValueError:
             pass
 
-        # 检查是否为有效的音符字符串格式
-        valid_patterns = [
-            r"^(?:h+|l+)?\d+(\.\d+)?d?$",  # 标准音符格式，如 l1, hh2, 1.5d
-            r"^-+$",  # 延长音符号
-            r"^0+$",  # 休止符
-        ]
-
-        for pattern in valid_patterns:
-            if re.match(pattern, token):
-                return True
-
-        return False
+        # 延长音符号（如 "--"）
+        # 标准音符格式（如 l1、hh2、1.5d）已被上面的字母和浮点数判断覆盖
+        return bool(token) and not token.strip("-")
 
     @staticmethod
     def is_balanced_parentheses(token: str) -> bool:
@@ -83,23 +86,12 @@ class TokenValidator:
         Returns:
             是否有效
         """
+        # 休止符、数字音符
+        if note_str == "-" or note_str.isdecimal():
+            return True
+
         # 允许的基本音符格式
-        valid_patterns = [
-            r"^-$",  # 休止符
-            r"^\d+$",  # 数字音符
-            r"^\d+\.\d+$",  # 浮点数音符（半音）
-            r"^(?:h+|l+)\d+$",  # 低音(l)或高音(h)，支持多八度前缀
-            r"^(?:h+|l+)\d+\.\d+$",  # 低音/高音的浮点数
-            r"^\d+d$",  # 带d的音符
-            r"^\d+\.\d+d$",  # 带d的浮点数音符
-            r"^[\d\. ()lh-]+$",  # 复合格式（空格、括号等，包含小数点）
-        ]
-
-        for pattern in valid_patterns:
-            if re.match(pattern, note_str):
-                return True
-
-        return False
+        return TokenValidator._NOTE_STRING_PATTERN.match(note_str) is not None
 
     @classmethod
     def validate_token_structure(cls, token: str) -> bool:
@@ -139,6 +131,41 @@ class TokenValidator:
             return False
 
 
+def _split_outside_brackets(text: str, any_whitespace: bool) -> List[str]:
+    """
+    在括号外的分隔符处分割文本，保持括号内容完整
+
+    Args:
+        text: 要分割的文本
+        any_whitespace: 为True时任意空白字符都是分隔符，否则只有空格是分隔符
+
+    Returns:
+        去除首尾空白后的非空片段列表
+    """
+    # 只记录当前片段的起始位置，在括号外的分隔符处整段切片，避免逐字符拼接
+    parts = []
+    start = 0
+    bracket_count = 0
+
+    for i, char in enumerate(text):
+        if char == "(":
+            bracket_count += 1
+        elif char == ")":
+            bracket_count -= 1
+        elif bracket_count == 0 and (char.isspace() if any_whitespace else char == " "):
+            part = text[start:i].strip()
+            if part:
+                parts.append(part)
+            start = i + 1
+
+    # 处理最后一个片段
+    part = text[start:].strip()
+    if part:
+        parts.append(part)
+
+    return parts
+
+
 class TokenParser:
     """Token解析器 - 处理复杂的token解析逻辑"""
 
@@ -153,30 +180,11 @@ class TokenParser:
         Returns:
             分割后的部分列表
         """
-        parts = []
-        current_part = ""
-        bracket_count = 0
+        # 无括号时直接整体分割，无需逐字符扫描
+        if "(" not in text and ")" not in text:
+            return [part.strip() for part in text.split(" ") if part.strip()]
 
-        for char in text:
-            if char == "(":
-                bracket_count += 1
-                current_part += char
-            elif char == ")":
-                bracket_count -= 1
-                current_part += char
-            elif char == " " and bracket_count == 0:
-                # 只在顶级空格处分割
-                if current_part.strip():
-                    parts.append(current_part.strip())
-                current_part = ""
-            else:
-                current_part += char
-
-        # 添加最后一部分
-        if current_part.strip():
-            parts.append(current_part.strip())
-
-        return parts
+        return _split_outside_brackets(text, any_whitespace=False)
 
     @staticmethod
     def tokenize_bar_string(bar_str: str) -> List[str]:
@@ -189,30 +197,11 @@ class TokenParser:
         Returns:
             分词后的列表，如 ["0", "0", "(0 3)", "(3 4)"]
         """
-        tokens = []
-        current_token = ""
-        bracket_count = 0
+        # 无括号时直接按空白分割，无需逐字符扫描
+        if "(" not in bar_str and ")" not in bar_str:
+            return bar_str.split()
 
-        for char in bar_str:
-            if char == "(":
-                bracket_count += 1
-                current_token += char
-            elif char == ")":
-                bracket_count -= 1
-                current_token += char
-            elif char.isspace() and bracket_count == 0:
-                # 只在括号外的空格处分割
-                if current_token.strip():
-                    tokens.append(current_token.strip())
-                    current_token = ""
-            else:
-                current_token += char
-
-        # 处理最后的token
-        if current_token.strip():
-            tokens.append(current_token.strip())
-
-        return tokens
+        return _split_outside_brackets(bar_str, any_whitespace=True)
 
     @classmethod
     def parse_basic_token(cls, token: str) -> Any:
@@ -2,6 +2,7 @@
 
 from typing import Dict
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
 
@@ -16,8 +17,9 @@ class Song:
     offset: float = 0.0
 
 
-def get_sample_songs() -> Dict[str, Song]:
-    """获取示例乐曲数据"""
+@lru_cache(maxsize=None)
+def _build_sample_songs() -> Dict[str, Song]:
+    """构建示例乐曲数据（只构建一次）"""
 
     songs = {
         "simple_scale": Song(
@@ -34,3 +36,16 @@ def get_sample_songs() -> Dict[str, Song]:
     }
 
     return songs
+
+
+def get_sample_songs() -> Dict[str, Song]:
+    """获取示例乐曲数据
+
+    返回的字典可自由修改，但其中的乐曲对象为共享实例，调用方不应修改其内容。
+    """
+    return dict(_build_sample_songs())
+
+
+def get_sample_song_count() -> int:
+    """获取示例乐曲数量（不复制整个示例字典）"""
+    return len(_build_sample_songs())
@@ -1,19 +1,22 @@
 """乐曲管理器"""
 
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Union, Any, Tuple
 from pathlib import Path
+import os
 import json
 import yaml
-import re
 
 from .sample_songs import Song
-from .sample_songs import get_sample_songs
+from .sample_songs import get_sample_songs, get_sample_song_count
 from ..parsers import JianpuParser, TokenValidator
 from ...utils.exceptions import SongNotFoundError
 from ...utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 优先使用libyaml的C加载器解析乐曲文件，未编译libyaml时回退到纯Python实现
+_YAML_LOADER = getattr(yaml, "CUnsafeLoader", yaml.UnsafeLoader)
+
 
 class SongManager:
     """乐曲管理器 - 负责加载和管理乐曲数据"""
@@ -22,14 +25,24 @@ class SongManager:
         self.songs_dir = songs_dir or Path("songs")
         self.songs: Dict[str, Song] = {}  # key -> Song
         self.name_to_key: Dict[str, str] = {}  # name -> key 映射
+        # 外部乐曲文件缓存：路径 -> (修改时间, 乐曲)，加载失败的文件乐曲为None
+        self._file_index: Dict[Path, Tuple[float, Optional[Song]]] = {}
+        # 乐曲集合版本号，刷新后乐曲有变化时递增，供缓存乐曲列表的组件判断是否过期
+        self.generation = 0
+        # 乐曲key -> 来源文件路径
+        self._key_to_file: Dict[str, Path] = {}
 
         # 初始化解析器
         self.jianpu_parser = JianpuParser()
 
         self._load_songs()
 
-    def _load_songs(self) -> None:
-        """加载所有乐曲数据"""
+    def _load_songs(self, song_files: Optional[Dict[Path, float]] = None) -> None:
+        """加载所有乐曲数据
+
+        Args:
+            song_files: 已扫描的外部乐曲文件及修改时间，未提供时扫描乐曲目录
+        """
         # 加载内置示例乐曲
         sample_songs = get_sample_songs()
         self.songs.update(sample_songs)
@@ -39,69 +52,139 @@ class SongManager:
         logger.info(f"Loaded {len(sample_songs)} sample songs")
 
         # 加载外部乐曲文件
-        if self.songs_dir.exists():
-            self._load_external_songs()
+        if song_files is None and self.songs_dir.exists():
+            song_files = self._scan_song_files()
+        if song_files:
+            self._load_external_songs(song_files)
 
-    def _load_external_songs(self) -> None:
-        """加载外部乐曲文件"""
+    def _load_external_songs(self, song_files: Dict[Path, float]) -> None:
+        """按扫描顺序加载外部乐曲文件，未修改的文件复用已解析的乐曲"""
         external_count = 0
 
-        for file_path in self.songs_dir.glob("*.yaml"):
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
+        for file_path, mtime in song_files.items():
+            entry = self._file_index.get(file_path)
+            if entry is not None and entry[0] == mtime:
+                song = entry[1]
+            else:
+                song = self._load_song_file(file_path)
+                # 加载失败的文件同样登记，未修改前不会被反复解析
+                self._file_index[file_path] = (mtime, song)
+
+            if song is not None:
+                key = song.name.lower().replace(" ", "_")
+                self.songs[key] = song
+                self.name_to_key[song.name] = key  # 添加name到key的映射
+                self._key_to_file[key] = file_path
+                external_count += 1
+
+        if external_count > 0:
+            logger.info(f"Loaded {external_count} external songs")
+
+    def _scan_song_files(self) -> Dict[Path, float]:
+        """单次遍历乐曲目录，返回外部乐曲文件及其修改时间（YAML在前，JSON在后）"""
+        yaml_files: Dict[Path, float] = {}
+        json_files: Dict[Path, float] = {}
+        try:
+            with os.scandir(self.songs_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.endswith(".yaml"):
+                        target = yaml_files
+                    elif name.endswith(".json"):
+                        target = json_files
+                    else:
+                        continue
+                    try:
+                        if entry.is_file():
+                            target[Path(entry.path)] = entry.stat().st_mtime
+                    except OSError as e:
+                        logger.error(f"Error loading song from {entry.path}: {e}")
+        except OSError:
+            return {}
+
+        yaml_files.update(json_files)
+        return yaml_files
+
+    def _load_song_file(self, file_path: Path) -> Optional[Song]:
+        """解析单个外部乐曲文件
+
+        Args:
+            file_path: 乐曲文件路径
+
+        Returns:
+            乐曲对象，加载失败时返回None
+        """
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                if file_path.suffix == ".json":
+                    data = json.load(f)
+                else:
                     # 对于legacy格式，使用unsafe_load来处理Python类型
-                    data = yaml.unsafe_load(f)
+                    data = yaml.load(f, Loader=_YAML_LOADER)
 
+            if file_path.suffix != ".json":
                 # 验证数据完整性
                 validation_errors = self.validate_song_data(data)
                 if validation_errors:
                     logger.error(f"Validation errors in {file_path}:")
                     for error in validation_errors:
                         logger.error(f"  - {error}")
-                    continue
+                    return None
 
                 # 使用新的解析器处理不同的YAML格式
                 format_type = self.jianpu_parser.detect_jianpu_format(data)
 
                 if format_type == "string_based":
                     # 统一处理所有基于字符串的格式
-                    logger.debug(f"Detected string-based format in {file_path}")
+                    logger.debug("Detected string-based format in %s", file_path)
                     data["jianpu"] = self.jianpu_parser.parse_unified_jianpu(
                         data["jianpu"]
                     )
                 elif format_type == "legacy":
                     # legacy格式直接使用，yaml.unsafe_load已经处理了Python类型
-                    logger.debug(f"Detected legacy format in {file_path}")
+                    logger.debug("Detected legacy format in %s", file_path)
                 else:
                     logger.warning(
                         f"Unknown YAML format in {file_path}, attempting legacy parsing"
                     )
 
-                song = Song(**data)
-                key = song.name.lower().replace(" ", "_")
-                self.songs[key] = song
-                self.name_to_key[song.name] = key  # 添加name到key的映射
-                external_count += 1
-                logger.debug(f"Loaded external song: {song.name}")
+            song = Song(**data)
+            logger.debug("Loaded external song: %s", song.name)
+            return song
 
-            except Exception as e:
-                logger.error(f"Error loading song from {file_path}: {e}")
+        except Exception as e:
+            logger.error(f"Error loading song from {file_path}: {e}")
+            return None
 
-        for file_path in self.songs_dir.glob("*.json"):
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    song = Song(**data)
-                    key = song.name.lower().replace(" ", "_")
-                    self.songs[key] = song
-                    self.name_to_key[song.name] = key  # 添加name到key的映射
-                    external_count += 1
-                    logger.debug(f"Loaded external song: {song.name}")
-            except Exception as e:
-                logger.error(f"Error loading song from {file_path}: {e}")
+    def refresh(self) -> int:
+        """刷新外部乐曲：只重新解析新增或修改过的文件，移除已删除文件的乐曲
 
-        if external_count > 0:
-            logger.info(f"Loaded {external_count} external songs")
+        有变化时按完整加载的顺序重建乐曲集合（JSON在YAML之后加载，同key时覆盖），
+        结果与重新创建SongManager一致。
+
+        Returns:
+            发生变化的文件数
+        """
+        current_files = self._scan_song_files()
+        removed = [p for p in self._file_index if p not in current_files]
+        changed = len(removed) + sum(
+            1
+            for file_path, mtime in current_files.items()
+            if self._file_index.get(file_path, (None,))[0] != mtime
+        )
+        if not changed:
+            return 0
+
+        for file_path in removed:
+            del self._file_index[file_path]
+
+        self.songs.clear()
+        self.name_to_key.clear()
+        self._key_to_file.clear()
+        self._load_songs(current_files)
+        self.generation += 1
+        logger.info(f"Refreshed {changed} changed song files")
+        return changed
 
     def get_song(self, name: str) -> Song:
         """获取指定名称的乐曲
@@ -161,6 +244,18 @@ class SongManager:
             raise SongNotFoundError(f"Song with key '{key}' not found")
         return self.songs[key]
 
+    def get_song_path(self, name: str) -> Optional[Path]:
+        """获取外部乐曲的来源文件路径
+
+        Args:
+            name: 乐曲名称或key
+
+        Returns:
+            来源文件路径，示例乐曲或未找到时返回None
+        """
+        key = self.name_to_key.get(name) or name.lower().replace(" ", "_")
+        return self._key_to_file.get(key)
+
     def list_songs(self) -> List[str]:
         """列出所有可用的乐曲key（向后兼容）"""
         return list(self.songs.keys())
@@ -217,6 +312,7 @@ class SongManager:
         key = song.name.lower().replace(" ", "_")
         self.songs[key] = song
         self.name_to_key[song.name] = key  # 添加name到key的映射
+        self.generation += 1
         logger.info(f"Added song: {song.name}")
 
     def save_song(self, song: Song, file_path: Path) -> None:
@@ -289,22 +385,11 @@ class SongManager:
             song = self.get_song(song_name)
 
             if output_path is None:
-                # 查找原始文件路径
+                # 通过加载时记录的索引查找原始文件路径
                 key = song_name.lower().replace(" ", "_")
-                original_file = None
+                original_file = self.get_song_path(song_name)
 
-                for file_path in self.songs_dir.glob("*.yaml"):
-                    try:
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            # 对于legacy格式，使用unsafe_load来处理Python类型
-                            data = yaml.unsafe_load(f)
-                            if data.get("name", "").lower().replace(" ", "_") == key:
-                                original_file = file_path
-                                break
-                    except:
-                        continue
-
-                if original_file:
+                if original_file and original_file.suffix == ".yaml":
                     output_path = original_file
                 else:
                     output_path = self.songs_dir / f"{key}_simplified.yaml"
@@ -370,15 +455,16 @@ class SongManager:
         }
 
         # 统计示例歌曲
-        sample_songs = get_sample_songs()
-        format_info["sample_songs"] = len(sample_songs)
+        format_info["sample_songs"] = get_sample_song_count()
 
         # 统计外部歌曲格式
-        for file_path in self.songs_dir.glob("*.yaml"):
+        for file_path in self._scan_song_files():
+            if file_path.suffix != ".yaml":
+                continue
             try:
                 with open(file_path, "r", encoding="utf-8") as f:
                     # 对于legacy格式，使用unsafe_load来处理Python类型
-                    data = yaml.unsafe_load(f)
+                    data = yaml.load(f, Loader=_YAML_LOADER)
                     format_type = self.jianpu_parser.detect_jianpu_format(data)
                     format_info["format_types"][format_type] += 1
                     format_info["external_songs"] += 1
@@ -1,20 +1,46 @@
 """统一的歌曲服务基类 - 封装通用的歌曲操作逻辑"""
 
-from typing import Optional, Dict, Any, Tuple
-from pathlib import Path
+from typing import Optional, Dict, Any, Tuple, List
+from collections import OrderedDict
 
 from ..config import get_app_config
+from ..core.parser import RelativeParser
+from ..core.converter import AutoConverter
+from ..data.music_theory import RelativeNote, PhysicalNote
 from ..utils.song_service import get_song_manager
 from ..utils.logger import setup_logging, get_logger
 from ..utils.error_handler import ErrorHandler, with_error_handling, UserFeedback
-from ..ui import InteractiveManager, SongSelector
+from ..ui import InteractiveManager, SongSelector, ui_factory
 
 logger = get_logger(__name__)
 
+# 交互菜单选项（内容固定，模块加载时构建一次）
+_BROWSE_MODE_OPTIONS = [
+    {"key": "browse", "desc": "🎵 浏览和选择歌曲 (动态搜索)"},
+    {"key": "list", "desc": "📋 显示所有歌曲 (静态列表)"},
+]
+_PLAY_OPTIONS = [
+    {"key": "default", "desc": "🎵 使用默认设置演奏"},
+    {"key": "custom", "desc": "⚙️ 自定义演奏参数"},
+]
+_STRATEGY_OPTIONS = [
+    {"key": "optimal", "desc": "🎯 最佳策略 (推荐)"},
+    {"key": "high", "desc": "⬆️ 高音优先策略"},
+    {"key": "low", "desc": "⬇️ 低音优先策略"},
+]
+
 
 class SongServiceBase:
     """歌曲服务基类 - 封装通用的歌曲操作逻辑，减少重复代码"""
 
+    # 解析/转换结果缓存（类级别共享，按乐曲名和策略索引，超出容量时淘汰最早的条目）
+    _CACHE_MAX_SIZE = 16
+    _parse_cache: "OrderedDict[str, Tuple[Any, List[List[RelativeNote]]]]" = (
+        OrderedDict()
+    )
+    _convert_cache: "OrderedDict[Tuple, Tuple[Any, Tuple[list, int]]]" = OrderedDict()
+    _analysis_cache: "OrderedDict[str, Tuple[Any, Dict[str, Any]]]" = OrderedDict()
+
     def __init__(self, setup_logging_level: bool = True):
         """
         初始化歌曲服务
@@ -36,22 +62,130 @@ class SongServiceBase:
         self._ui_manager = None
         self._song_selector = None
 
+        # 解析器和转换器（延迟初始化）
+        self._parser: Optional[RelativeParser] = None
+        self._converter: Optional[AutoConverter] = None
+
+        # 演奏回调（由 set_play_callback 设置）
+        self._play_callback = None
+
         logger.debug("SongServiceBase initialized")
 
     @property
     def ui_manager(self) -> InteractiveManager:
         """获取UI管理器（延迟初始化）"""
         if self._ui_manager is None:
-            self._ui_manager = InteractiveManager()
+            # 界面管理器无会话状态，各服务实例共享同一个
+            self._ui_manager = ui_factory.get_interactive_manager()
         return self._ui_manager
 
     @property
     def song_selector(self) -> SongSelector:
         """获取歌曲选择器（延迟初始化）"""
         if self._song_selector is None:
-            self._song_selector = SongSelector(self.song_manager)
+            # 同一歌曲管理器的选择器在各服务实例间共享，避免重复构建歌曲列表和搜索索引
+            self._song_selector = ui_factory.get_song_selector(self.song_manager)
         return self._song_selector
 
+    @property
+    def parser(self) -> RelativeParser:
+        """获取简谱解析器（延迟初始化）"""
+        if self._parser is None:
+            self._parser = RelativeParser()
+        return self._parser
+
+    @property
+    def converter(self) -> AutoConverter:
+        """获取音符转换器（延迟初始化）"""
+        if self._converter is None:
+            self._converter = AutoConverter()
+        return self._converter
+
+    @classmethod
+    def _cache_get(cls, cache: OrderedDict, key: Any, song: Any) -> Optional[Any]:
+        """读取缓存条目，乐曲对象已变化（如重新加载）时视为未命中"""
+        entry = cache.get(key)
+        if entry is None or entry[0] is not song:
+            return None
+        return entry[1]
+
+    @classmethod
+    def _cache_put(cls, cache: OrderedDict, key: Any, song: Any, value: Any) -> None:
+        """写入缓存条目，超出容量时淘汰最早的条目"""
+        cache[key] = (song, value)
+        while len(cache) > cls._CACHE_MAX_SIZE:
+            cache.popitem(last=False)
+
+    def get_parsed_jianpu(self, song: Any) -> List[List[RelativeNote]]:
+        """
+        获取乐曲解析后的相对音高简谱（带缓存）
+
+        Args:
+            song: 歌曲对象
+
+        Returns:
+            解析后的相对音符小节列表
+        """
+        parsed = self._cache_get(self._parse_cache, song.name, song)
+        if parsed is None:
+            parsed = self.parser.parse(song.jianpu)
+            self._cache_put(self._parse_cache, song.name, song, parsed)
+        return parsed
+
+    def get_converted_jianpu(
+        self, song: Any, strategy: str = "optimal", strategy_param: Any = None
+    ) -> Tuple[List[List[PhysicalNote]], int]:
+        """
+        获取乐曲转换后的物理音符（带缓存）
+
+        Args:
+            song: 歌曲对象
+            strategy: 映射策略 ("optimal", "high", "low", "auto", "manual")
+            strategy_param: 策略参数（auto为偏好策略，manual为偏移量）
+
+        Returns:
+            (物理音符小节列表, 无法演奏的音符数)
+        """
+        key = (song.name, strategy, strategy_param)
+        cached = self._cache_get(self._convert_cache, key, song)
+        if cached is not None:
+            return cached
+
+        parsed = self.get_parsed_jianpu(song)
+        if strategy == "manual":
+            result = self.converter.convert_jianpu_with_stats(
+                parsed, strategy="manual", manual_offset=strategy_param
+            )
+        elif strategy == "auto":
+            result = self.converter.convert_jianpu_with_stats(
+                parsed, strategy="auto", auto_preference=strategy_param
+            )
+        else:
+            result = self.converter.convert_jianpu_with_stats(parsed, strategy=strategy)
+
+        self._cache_put(self._convert_cache, key, song, result)
+        return result
+
+    def get_song_analysis(self, song: Any) -> Dict[str, Any]:
+        """
+        获取乐曲的音域信息与映射建议预览（带缓存）
+
+        Args:
+            song: 歌曲对象
+
+        Returns:
+            包含 "range_info" 和 "preview" 的分析结果字典
+        """
+        analysis = self._cache_get(self._analysis_cache, song.name, song)
+        if analysis is None:
+            parsed = self.get_parsed_jianpu(song)
+            analysis = {
+                "range_info": self.parser.get_range_info(parsed),
+                "preview": self.converter.get_conversion_preview(parsed),
+            }
+            self._cache_put(self._analysis_cache, song.name, song, analysis)
+        return analysis
+
     def get_song_by_name_or_interactive(
         self,
         song_name: Optional[str],
@@ -182,6 +316,13 @@ class SongServiceBase:
         print(error_msg)
         return False
 
+    @staticmethod
+    def _format_song_line(song_info: Dict[str, Any]) -> str:
+        """格式化歌曲列表中的一行"""
+        description = song_info["description"]
+        desc_text = f" - {description[:40]}..." if description else ""
+        return f"   {song_info['name']:<25} (BPM: {song_info['bpm']}){desc_text}"
+
     @with_error_handling("列出歌曲", return_on_error=False)
     def list_all_songs_info(self) -> bool:
         """
@@ -194,12 +335,9 @@ class SongServiceBase:
         print("📋 可用乐曲:")
 
         songs_info = self.song_manager.list_songs_with_info()
-        for song_info in songs_info:
-            name = song_info["name"]
-            bpm = song_info["bpm"]
-            description = song_info["description"]
-            desc_text = f" - {description[:40]}..." if description else ""
-            print(f"   {name:<25} (BPM: {bpm}){desc_text}")
+        # 整个列表一次性拼接输出，避免逐行写入终端
+        if songs_info:
+            print("\n".join(self._format_song_line(info) for info in songs_info))
 
         UserFeedback.print_operation_complete("加载歌曲列表", success=True)
         return True
@@ -211,12 +349,9 @@ class SongServiceBase:
         self.ui_manager.show_welcome("歌曲列表浏览")
 
         while True:
-            options = [
-                {"key": "browse", "desc": "🎵 浏览和选择歌曲 (动态搜索)"},
-                {"key": "list", "desc": "📋 显示所有歌曲 (静态列表)"},
-            ]
-
-            choice = self.ui_manager.show_menu("歌曲浏览模式", options, show_quit=True)
+            choice = self.ui_manager.show_menu(
+                "歌曲浏览模式", _BROWSE_MODE_OPTIONS, show_quit=True
+            )
 
             if choice is None:
                 break
@@ -286,13 +421,8 @@ class SongServiceBase:
         """处理演奏选项"""
         self.ui_manager.show_progress("准备演奏...")
 
-        play_options = [
-            {"key": "default", "desc": "🎵 使用默认设置演奏"},
-            {"key": "custom", "desc": "⚙️ 自定义演奏参数"},
-        ]
-
         play_choice = self.ui_manager.show_menu(
-            "演奏选项", play_options, show_quit=False
+            "演奏选项", _PLAY_OPTIONS, show_quit=False
         )
 
         # 准备演奏参数
@@ -311,14 +441,8 @@ class SongServiceBase:
     ) -> Tuple[list, Optional[int], Optional[int]]:
         """获取自定义演奏参数"""
         # 策略选择
-        strategy_options = [
-            {"key": "optimal", "desc": "🎯 最佳策略 (推荐)"},
-            {"key": "high", "desc": "⬆️ 高音优先策略"},
-            {"key": "low", "desc": "⬇️ 低音优先策略"},
-        ]
-
         strategy_choice = self.ui_manager.show_menu(
-            "选择演奏策略", strategy_options, show_quit=False
+            "选择演奏策略", _STRATEGY_OPTIONS, show_quit=False
         )
         strategy_args = [strategy_choice] if strategy_choice else ["optimal"]
 
@@ -351,7 +475,7 @@ class SongServiceBase:
         ready_time: Optional[int],
     ) -> None:
         """执行演奏"""
-        if not hasattr(self, "_play_callback") or self._play_callback is None:
+        if self._play_callback is None:
             self.ui_manager.show_error("演奏功能未配置")
             return
 
@@ -371,7 +495,7 @@ class SongServiceBase:
 
     def _play_song_with_defaults(self, song_name: str) -> None:
         """使用默认设置演奏歌曲"""
-        if not hasattr(self, "_play_callback") or self._play_callback is None:
+        if self._play_callback is None:
             self.ui_manager.show_error("演奏功能未配置")
             return
 
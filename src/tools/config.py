@@ -6,6 +6,8 @@ from pathlib import Path
 import json
 from dotenv import load_dotenv
 
+from ..utils.file_utils import FileUtils
+
 # 加载环境变量
 load_dotenv()
 
@@ -124,8 +126,7 @@ class ToolsConfig:
         """保存配置到文件"""
         try:
             self.config_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.config_file, "w", encoding="utf-8") as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
+            FileUtils.write_json(self.config_file, self.config)
         except Exception as e:
             print(f"Warning: Failed to save config file {self.config_file}: {e}")
 
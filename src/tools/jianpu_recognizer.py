@@ -1,13 +1,10 @@
 """简谱识别器 - 多模态AI服务统一接口"""
 
 import base64
-import json
 import time
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List
-from pathlib import Path
 import requests
-from io import BytesIO
 
 from .config import ToolsConfig, JIANPU_RECOGNITION_PROMPT
 from ..utils.logger import get_logger
@@ -278,11 +275,11 @@ class GeminiJianpuProvider(JianpuRecognitionProvider):
 
             # 调用API
             logger.debug(f"Calling Gemini API with model: {self.model}")
-            start_time = time.time()
+            start_time = time.perf_counter()
             response = self.client.models.generate_content(
                 model=self.model, contents=contents
             )
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
 
             # 获取响应文本
             if hasattr(response, "text") and response.text:
@@ -350,9 +347,9 @@ class DoubaoJianpuProvider(JianpuRecognitionProvider):
         }
 
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
             response = self._make_request_with_retry(url, headers, data)
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
             result = response.json()
 
             if "choices" in result and result["choices"]:
@@ -1,6 +1,5 @@
 """简谱乐谱导入器 - 图片预处理和YAML生成"""
 
-import os
 import yaml
 from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
@@ -10,7 +9,6 @@ import io
 from .jianpu_recognizer import JianpuRecognizer
 from .config import ToolsConfig
 from ..data.songs.song_manager import SongManager
-from ..data.songs.sample_songs import Song
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
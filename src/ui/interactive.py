@@ -6,26 +6,40 @@ from rich.prompt import Prompt, Confirm
 from rich.panel import Panel
 from rich.text import Text
 from rich.table import Table
-from rich.live import Live
-from rich.layout import Layout
 import sys
 
+# 全局共享的控制台实例（首次使用时创建）
+_console: Optional[Console] = None
+
+
+def get_console() -> Console:
+    """获取共享的控制台实例，避免各界面组件重复创建和探测终端"""
+    global _console
+    if _console is None:
+        _console = Console()
+    return _console
+
 
 class InteractiveManager:
     """交互式界面管理器 - 提供通用的交互式界面功能"""
 
+    # 欢迎面板按标题缓存，内容固定，重复进入界面时直接复用
+    _welcome_panels: Dict[str, Panel] = {}
+
     def __init__(self):
-        self.console = Console()
+        self.console = get_console()
 
     def show_welcome(self, title: str = "Animal Well 笛子自动演奏"):
         """显示欢迎信息"""
-        welcome_text = Text(title, style="bold cyan")
-        panel = Panel(
-            welcome_text,
-            title="🎵 欢迎",
-            border_style="cyan",
-            padding=(1, 2),
-        )
+        panel = self._welcome_panels.get(title)
+        if panel is None:
+            panel = Panel(
+                Text(title, style="bold cyan"),
+                title="🎵 欢迎",
+                border_style="cyan",
+                padding=(1, 2),
+            )
+            self._welcome_panels[title] = panel
         self.console.print(panel)
         self.console.print()
 
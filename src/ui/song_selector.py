@@ -1,16 +1,82 @@
 """歌曲选择和搜索界面模块"""
 
-from typing import List, Optional, Dict
-from dataclasses import dataclass
+import sys
+from typing import List, Optional, Dict, Set, Tuple
+from dataclasses import dataclass, field
 from difflib import SequenceMatcher
+from functools import lru_cache
+from collections import OrderedDict
 
-from rich.console import Console
 from rich.table import Table
+from rich.text import Text
 from prompt_toolkit import prompt
-from prompt_toolkit.completion import Completer, Completion
+from prompt_toolkit.completion import Completer, Completion, ThreadedCompleter
 from prompt_toolkit.shortcuts import radiolist_dialog, input_dialog
 
 from ..data.songs.song_manager import SongManager
+from .interactive import get_console
+
+# 空描述占位（预先构造，避免每行重复解析标记）
+_NO_DESCRIPTION = Text("无描述", style="dim")
+
+
+@lru_cache(maxsize=512)
+def _match_ratio(query: str, target: str) -> float:
+    """计算两个字符串的相似度（按参数缓存，重复搜索时复用结果）"""
+    return SequenceMatcher(None, query, target).ratio()
+
+
+# 单字符读取实现按平台在导入时确定一次，翻页循环中不再重复判断平台
+# 平台模块同样只在导入时尝试加载一次，不可用时读取函数直接返回None
+if sys.platform == "win32":
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+    def _read_single_char() -> Optional[str]:
+        """获取单个字符输入（不需要回车）- Windows"""
+        if msvcrt is None:
+            return None
+
+        # Windows: 使用msvcrt.getch()阻塞等待单字符，不轮询kbhit()空转
+        while True:
+            char = msvcrt.getch()
+            if isinstance(char, bytes):
+                try:
+                    return char.decode("utf-8").lower()
+                except UnicodeDecodeError:
+                    # 处理特殊键如方向键
+                    if char == b"\xe0":  # 扩展键前缀
+                        msvcrt.getch()  # 读取后续字符
+                    continue
+            return char.lower()
+
+else:
+    try:
+        import termios
+        import tty
+    except ImportError:
+        termios = tty = None
+
+    def _read_single_char() -> Optional[str]:
+        """获取单个字符输入（不需要回车）- Unix"""
+        if termios is None:
+            return None
+
+        # Unix系统: 使用termios/tty（标准输入不是终端时会失败）
+        try:
+            fd = sys.stdin.fileno()
+            old_settings = termios.tcgetattr(fd)
+        except (OSError, AttributeError, ValueError, termios.error):
+            return None
+        try:
+            tty.setcbreak(fd)
+            return sys.stdin.read(1).lower()
+        except (AttributeError, OSError, termios.error):
+            return None
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
 
 
 @dataclass
@@ -23,46 +89,75 @@ class SongInfo:
     description: str
     bars: int
 
+    # 搜索用的预处理字段，创建时计算一次，避免每次搜索重复转换
+    name_lower: str = field(init=False, repr=False, compare=False)
+    key_lower: str = field(init=False, repr=False, compare=False)
+    description_lower: str = field(init=False, repr=False, compare=False)
+    bpm_str: str = field(init=False, repr=False, compare=False)
+    # 名称、key、描述的合并搜索串（以\x00分隔，避免跨字段匹配）
+    search_blob: str = field(init=False, repr=False, compare=False)
+    # 列表显示用的预格式化字段（描述超过30字符时截断）
+    bars_str: str = field(init=False, repr=False, compare=False)
+    description_display: str = field(init=False, repr=False, compare=False)
+    # 名称与描述为纯文本，预先构造 Text，渲染时跳过 rich 标记解析
+    name_text: Text = field(init=False, repr=False, compare=False)
+    description_text: Text = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.name_lower = self.name.lower()
+        self.key_lower = self.key.lower()
+        self.description_lower = self.description.lower() if self.description else ""
+        self.bpm_str = str(self.bpm)
+        self.search_blob = "\x00".join(
+            (self.name_lower, self.key_lower, self.description_lower)
+        )
+        description = self.description or ""
+        self.bars_str = str(self.bars)
+        self.description_display = (
+            description[:30] + "..." if len(description) > 30 else description
+        )
+        self.name_text = Text(self.name)
+        self.description_text = (
+            Text(self.description_display)
+            if self.description_display
+            else _NO_DESCRIPTION
+        )
+
     def matches_search(self, query: str) -> bool:
         """检查是否匹配搜索关键词"""
         query = query.lower().strip()
         if not query:
             return True
 
-        # 检查名称
-        if query in self.name.lower():
-            return True
-
-        # 检查key
-        if query in self.key.lower():
-            return True
-
-        # 检查描述
-        if self.description and query in self.description.lower():
+        # 检查名称、key和描述
+        if query in self.search_blob:
             return True
 
         # 检查BPM
-        if query.isdigit() and str(self.bpm) == query:
+        if query.isdigit() and self.bpm_str == query:
             return True
 
         return False
 
     def similarity_score(self, query: str) -> float:
         """计算与搜索词的相似度（优先考虑Name匹配）"""
-        query = query.lower().strip()
+        return self._similarity_normalized(query.lower().strip())
+
+    def _similarity_normalized(self, query: str) -> float:
+        """计算与已规范化（小写、去空白）搜索词的相似度"""
         if not query:
             return 1.0
 
         # 计算名称相似度（权重更高）
-        name_ratio = SequenceMatcher(None, query, self.name.lower()).ratio()
+        name_ratio = _match_ratio(query, self.name_lower)
 
         # 计算key相似度（权重较低，用于兼容性）
-        key_ratio = SequenceMatcher(None, query, self.key.lower()).ratio() * 0.8
+        key_ratio = _match_ratio(query, self.key_lower) * 0.8
 
         # 检查是否包含关键词（Name匹配的bonus更高）
-        if query in self.name.lower():
+        if query in self.name_lower:
             contains_bonus = 0.5
-        elif query in self.key.lower():
+        elif query in self.key_lower:
             contains_bonus = 0.3
         else:
             contains_bonus = 0
@@ -75,18 +170,28 @@ class SongCompleter(Completer):
 
     def __init__(self, songs: List[SongInfo]):
         self.songs = songs
+        # 上一次补全的 (输入, 匹配歌曲)，输入未变化时直接复用（整体替换，线程安全）
+        self._last: Tuple[Optional[str], List[SongInfo]] = (None, [])
 
     def get_completions(self, document, complete_event):
         text = document.text_before_cursor.lower()
 
-        for song in self.songs:
+        # 输入为空时所有歌曲都会匹配，仅在用户主动请求补全（Tab）时才列出
+        if not text and not complete_event.completion_requested:
+            return
+
+        last_text, matches = self._last
+        if text != last_text:
             # 只基于歌曲名称进行补全，交互界面不需要暴露key概念
-            if text in song.name.lower():
-                yield Completion(
-                    song.name,
-                    start_position=-len(text),
-                    display=f"{song.name} (BPM: {song.bpm})",
-                )
+            matches = [song for song in self.songs if text in song.name_lower]
+            self._last = (text, matches)
+
+        for song in matches:
+            yield Completion(
+                song.name,
+                start_position=-len(text),
+                display=f"{song.name} (BPM: {song.bpm})",
+            )
 
 
 class SongSelector:
@@ -94,13 +199,26 @@ class SongSelector:
 
     def __init__(self, song_manager: SongManager):
         self.song_manager = song_manager
-        self.console = Console()
+        self.console = get_console()
         self.songs: List[SongInfo] = []
         self.filtered_songs: List[SongInfo] = []
         self.current_search = ""
         self.selected_index = 0
         self.page_size = 10
         self.current_page = 0
+        # 搜索补全器（延迟创建，歌曲列表重新加载时重建）
+        self._completer: Optional[Completer] = None
+        # 搜索字段按列存储（与 self.songs 下标一一对应），过滤时只访问所需字段
+        self._search_blobs: List[str] = []
+        self._bpm_strs: List[str] = []
+        # 三元组倒排索引：3字符片段 -> 包含该片段的歌曲序号集合
+        # （首次需要时构建，只浏览列表不搜索时无需构建）
+        self._trigram_index: Optional[Dict[str, Set[int]]] = None
+        # 搜索结果缓存：规范化查询词 -> (匹配序号, 排序后的结果)（最近使用的32条）
+        self._search_cache: "OrderedDict[str, Tuple[List[int], List[SongInfo]]]" = (
+            OrderedDict()
+        )
+        self._search_cache_size = 32
 
         self._load_songs()
 
@@ -108,20 +226,23 @@ class SongSelector:
         """加载所有歌曲信息"""
         self.songs = []
 
-        # 使用新的list_songs_with_info方法获取详细信息
+        # 直接从乐曲对象构建信息（与list_songs_with_info相同的歌曲集合），
+        # 省去中间字典和数值到字符串再转回的开销，排序在下方统一进行
         try:
-            songs_info = self.song_manager.list_songs_with_info()
-            for song_info_dict in songs_info:
+            all_songs = self.song_manager.songs
+            for key in self.song_manager.name_to_key.values():
+                song = all_songs[key]
                 song_info = SongInfo(
-                    key=song_info_dict["key"],
-                    name=song_info_dict["name"],
-                    bpm=int(song_info_dict["bpm"]),
-                    description=song_info_dict["description"],
-                    bars=int(song_info_dict["bars"]),
+                    key=key,
+                    name=song.name,
+                    bpm=int(song.bpm),
+                    description=song.description or "",
+                    bars=len(song.jianpu) if song.jianpu else 0,
                 )
                 self.songs.append(song_info)
         except Exception:
             # 如果新方法失败，回退到旧方法
+            self.songs = []
             for song_key in self.song_manager.list_songs():
                 try:
                     song = self.song_manager.get_song(song_key)
@@ -139,19 +260,118 @@ class SongSelector:
 
         # 按名称排序
         self.songs.sort(key=lambda x: x.name)
-        self.filtered_songs = self.songs.copy()
+        self.filtered_songs = self.songs
+        self._loaded_generation = self.song_manager.generation
+        self._completer = None
+        self._search_cache.clear()
+        self._build_search_columns()
+        self._trigram_index = None
+
+    def reload_if_changed(self) -> bool:
+        """乐曲管理器刷新后乐曲有变化时重新加载歌曲信息
+
+        Returns:
+            是否重新加载
+        """
+        if self._loaded_generation == self.song_manager.generation:
+            return False
+        self._load_songs()
+        return True
+
+    def _build_search_columns(self):
+        """按列提取各歌曲的搜索字段"""
+        self._search_blobs = [song.search_blob for song in self.songs]
+        self._bpm_strs = [song.bpm_str for song in self.songs]
+
+    def _build_trigram_index(self) -> Dict[str, Set[int]]:
+        """构建搜索字段的三元组倒排索引"""
+        index: Dict[str, Set[int]] = {}
+        for i, (blob, bpm_str) in enumerate(zip(self._search_blobs, self._bpm_strs)):
+            # 直接复用合并搜索串，BPM 同样以\x00分隔，跨字段片段不会被查询命中
+            text = f"{blob}\x00{bpm_str}"
+            for j in range(len(text) - 2):
+                index.setdefault(text[j : j + 3], set()).add(i)
+        self._trigram_index = index
+        return index
+
+    def _candidate_indices(self, query: str) -> Optional[List[int]]:
+        """根据三元组索引筛选可能匹配的歌曲序号（结果仍需逐个校验）
+
+        Returns:
+            候选序号列表；查询过短无法使用索引时返回None
+        """
+        if len(query) < 3:
+            return None
+
+        index = self._trigram_index
+        if index is None:
+            index = self._build_trigram_index()
+
+        postings = []
+        for j in range(len(query) - 2):
+            posting = index.get(query[j : j + 3])
+            if not posting:
+                return []
+            postings.append(posting)
+
+        return sorted(set.intersection(*postings))
+
+    def _match_indices(self, query: str) -> List[int]:
+        """返回匹配规范化查询词的歌曲序号（与 SongInfo.matches_search 规则一致）"""
+        blobs = self._search_blobs
+        bpms = self._bpm_strs
+        check_bpm = query.isdigit()
+
+        # 输入逐字追加时，新查询的匹配必然包含于其前缀查询的匹配之中，
+        # 直接在最长的已缓存前缀结果上过滤（纯数字查询可按BPM相等匹配，不满足该性质）
+        if not check_bpm:
+            prefix = max(
+                (p for p in self._search_cache if query.startswith(p)),
+                key=len,
+                default=None,
+            )
+            if prefix is not None:
+                base = self._search_cache[prefix][0]
+                return [i for i in base if query in blobs[i]]
+
+        candidates = self._candidate_indices(query)
+        indices = range(len(blobs)) if candidates is None else candidates
+        return [
+            i for i in indices if query in blobs[i] or (check_bpm and bpms[i] == query)
+        ]
+
+    @property
+    def completer(self) -> Completer:
+        """获取歌曲名称补全器（在多次搜索提示之间复用）"""
+        if self._completer is None:
+            # 补全在后台线程中计算，快速输入时不阻塞按键处理，过期的补全会被丢弃
+            self._completer = ThreadedCompleter(SongCompleter(self.songs))
+        return self._completer
 
     def search_songs(self, query: str) -> List[SongInfo]:
-        """搜索歌曲"""
-        if not query.strip():
+        """搜索歌曲（返回的列表可能被缓存复用，调用方不应修改）"""
+        # 查询词只规范化一次，过滤和排序共用
+        query = query.lower().strip()
+        if not query:
             return self.songs
 
-        # 过滤匹配的歌曲
-        matching_songs = [song for song in self.songs if song.matches_search(query)]
+        # 回退删除等重复查询直接复用缓存结果
+        cached = self._search_cache.get(query)
+        if cached is not None:
+            self._search_cache.move_to_end(query)
+            return cached[1]
+
+        # 过滤匹配的歌曲（先用索引缩小范围，再按列逐个校验）
+        songs = self.songs
+        indices = self._match_indices(query)
+        matching_songs = [songs[i] for i in indices]
 
         # 按相似度排序
-        matching_songs.sort(key=lambda x: x.similarity_score(query), reverse=True)
+        matching_songs.sort(key=lambda x: x._similarity_normalized(query), reverse=True)
 
+        self._search_cache[query] = (indices, matching_songs)
+        if len(self._search_cache) > self._search_cache_size:
+            self._search_cache.popitem(last=False)
         return matching_songs
 
     def select_song_simple(
@@ -180,7 +400,7 @@ class SongSelector:
             try:
                 search_query = prompt(
                     "搜索: ",
-                    completer=SongCompleter(self.songs),
+                    completer=self.completer,
                     complete_while_typing=True,
                 ).strip()
             except KeyboardInterrupt:
@@ -197,7 +417,7 @@ class SongSelector:
                 continue
 
             # 显示搜索结果
-            self._display_song_list(filtered_songs, max_display=20)
+            self._display_song_list_paginated(filtered_songs, page=0, page_size=20)
 
             # 获取用户选择
             if len(filtered_songs) == 1:
@@ -295,15 +515,10 @@ class SongSelector:
         except KeyboardInterrupt:
             return None
 
-    def _display_song_list_paginated(
-        self, songs: List[SongInfo], page: int = 0, page_size: int = 20
-    ):
-        """分页显示歌曲列表"""
-        if not songs:
-            self.console.print("[red]没有歌曲可显示[/red]")
-            return
-
-        total_pages = (len(songs) - 1) // page_size + 1
+    def _build_song_table(
+        self, songs: List[SongInfo], page: int, page_size: int, total_pages: int
+    ) -> Table:
+        """构建指定页的歌曲表格"""
         start_idx = page * page_size
         end_idx = min(start_idx + page_size, len(songs))
         display_songs = songs[start_idx:end_idx]
@@ -324,21 +539,44 @@ class SongSelector:
         table.add_column("描述", style="dim", min_width=20)
 
         # 添加行数据，序号保持全局序号
-        for i, song in enumerate(display_songs):
-            global_idx = start_idx + i + 1
-            description = (
-                song.description[:30] + "..."
-                if len(song.description) > 30
-                else song.description
-            )
+        for i, song in enumerate(display_songs, start_idx + 1):
             table.add_row(
-                str(global_idx),
-                song.name,
-                str(song.bpm),
-                str(song.bars),
-                description or "[dim]无描述[/dim]",
+                str(i),
+                song.name_text,
+                song.bpm_str,
+                song.bars_str,
+                song.description_text,
             )
 
+        return table
+
+    def _display_song_list_paginated(
+        self,
+        songs: List[SongInfo],
+        page: int = 0,
+        page_size: int = 20,
+        table_cache: Optional[Dict[int, Table]] = None,
+    ):
+        """分页显示歌曲列表
+
+        Args:
+            songs: 歌曲列表
+            page: 页码（从0开始）
+            page_size: 每页数量
+            table_cache: 可选的 页码 -> 表格 缓存，同一列表反复翻页时复用已构建的表格
+        """
+        if not songs:
+            self.console.print("[red]没有歌曲可显示[/red]")
+            return
+
+        total_pages = (len(songs) - 1) // page_size + 1
+
+        table = table_cache.get(page) if table_cache is not None else None
+        if table is None:
+            table = self._build_song_table(songs, page, page_size, total_pages)
+            if table_cache is not None:
+                table_cache[page] = table
+
         self.console.print(table)
 
         # 显示翻页提示
@@ -368,73 +606,41 @@ class SongSelector:
             self.console.print("[red]❌ 没有可用的歌曲[/red]")
             return None
 
-        import sys
-
         current_page = 0
         page_size = 20
         total_pages = (len(self.songs) - 1) // page_size + 1
-
-        def get_single_char():
-            """获取单个字符输入（不需要回车）- 跨平台兼容"""
-            if sys.platform == "win32":
-                try:
-                    import msvcrt
-
-                    # Windows: 使用msvcrt.getch()获取单字符
-                    while True:
-                        if msvcrt.kbhit():
-                            char = msvcrt.getch()
-                            if isinstance(char, bytes):
-                                try:
-                                    return char.decode("utf-8").lower()
-                                except UnicodeDecodeError:
-                                    # 处理特殊键如方向键
-                                    if char == b"\xe0":  # 扩展键前缀
-                                        msvcrt.getch()  # 读取后续字符
-                                    continue
-                            return char.lower()
-                except ImportError:
-                    return None
-            else:
-                try:
-                    import tty
-                    import termios
-
-                    # Unix系统: 使用termios/tty
-                    fd = sys.stdin.fileno()
-                    old_settings = termios.tcgetattr(fd)
-                    try:
-                        tty.cbreak(fd)
-                        char = sys.stdin.read(1).lower()
-                        return char
-                    finally:
-                        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-                except (ImportError, OSError, AttributeError):
-                    return None
-            return None
+        # 翻页浏览期间歌曲列表不变，各页表格只构建一次
+        page_tables: Dict[int, Table] = {}
+        # 当前已显示的页码，按键未引起翻页时不再清屏重绘
+        shown_page: Optional[int] = None
 
         while True:
-            # 清屏并显示当前页
-            self.console.clear()
-            self._display_song_list_paginated(
-                self.songs, page=current_page, page_size=page_size
-            )
+            if current_page != shown_page:
+                # 清屏并显示当前页
+                self.console.clear()
+                self._display_song_list_paginated(
+                    self.songs,
+                    page=current_page,
+                    page_size=page_size,
+                    table_cache=page_tables,
+                )
 
-            # 显示导航提示
-            nav_tips = []
-            if current_page > 0:
-                nav_tips.append("[cyan]p[/cyan] 上一页")
-            if current_page < total_pages - 1:
-                nav_tips.append("[cyan]n[/cyan] 下一页")
-            nav_tips.append("[cyan]s[/cyan] 选择歌曲")
-            nav_tips.append("[cyan]q[/cyan] 退出")
+                # 显示导航提示
+                nav_tips = []
+                if current_page > 0:
+                    nav_tips.append("[cyan]p[/cyan] 上一页")
+                if current_page < total_pages - 1:
+                    nav_tips.append("[cyan]n[/cyan] 下一页")
+                nav_tips.append("[cyan]s[/cyan] 选择歌曲")
+                nav_tips.append("[cyan]q[/cyan] 退出")
 
-            self.console.print(f"\n[dim]导航: {' | '.join(nav_tips)}[/dim]")
-            self.console.print("[dim]请按键 (无需回车):[/dim]", end=" ")
+                self.console.print(f"\n[dim]导航: {' | '.join(nav_tips)}[/dim]")
+                self.console.print("[dim]请按键 (无需回车):[/dim]", end=" ")
+                shown_page = current_page
 
             try:
                 # 获取单个字符
-                char = get_single_char()
+                char = _read_single_char()
 
                 if char is None:
                     # 如果直接按键不可用，回退到传统方式
@@ -533,4 +739,4 @@ class SongSelector:
         """搜索并显示结果"""
         filtered_songs = self.search_songs(query)
         self.console.print(f"\n[cyan]搜索 '{query}' 的结果:[/cyan]")
-        self._display_song_list(filtered_songs)
+        self._display_song_list_paginated(filtered_songs, page=0, page_size=20)
@@ -12,7 +12,8 @@ class UIManagerFactory:
     def __init__(self):
         # 缓存组件实例，避免重复创建
         self._interactive_managers: Dict[str, InteractiveManager] = {}
-        self._song_selectors: Dict[str, SongSelector] = {}
+        # 歌曲选择器按上下文分组，再按歌曲管理器区分
+        self._song_selectors: Dict[str, Dict[int, SongSelector]] = {}
 
     def get_interactive_manager(
         self, context_key: str = "default"
@@ -45,12 +46,17 @@ class UIManagerFactory:
             SongSelector实例
         """
         # 为每个song_manager创建独立的选择器
-        cache_key = f"{context_key}_{id(song_manager)}"
+        selectors = self._song_selectors.setdefault(context_key, {})
+        manager_id = id(song_manager)
 
-        if cache_key not in self._song_selectors:
-            self._song_selectors[cache_key] = SongSelector(song_manager)
+        selector = selectors.get(manager_id)
+        if selector is None:
+            selector = selectors[manager_id] = SongSelector(song_manager)
+        else:
+            # 复用已构建的选择器，乐曲有变化时才重新加载
+            selector.reload_if_changed()
 
-        return self._song_selectors[cache_key]
+        return selector
 
     def create_ui_context(
         self, song_manager: SongManager, context_name: str = "default"
@@ -83,13 +89,7 @@ class UIManagerFactory:
         else:
             self._interactive_managers.pop(context_key, None)
             # 清理对应的song_selector（可能有多个）
-            keys_to_remove = [
-                key
-                for key in self._song_selectors.keys()
-                if key.startswith(f"{context_key}_")
-            ]
-            for key in keys_to_remove:
-                self._song_selectors.pop(key, None)
+            self._song_selectors.pop(context_key, None)
 
 
 # 全局UI工厂实例
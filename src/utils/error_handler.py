@@ -79,16 +79,15 @@ class ErrorHandler:
             格式化的错误消息
         """
         error_count = len(validation_errors)
-        error_msg = f"❌ {context}失败 ({error_count} 个错误):"
+        lines = [f"❌ {context}失败 ({error_count} 个错误):"]
 
         # 只显示前3个错误，避免输出过长
-        for i, error in enumerate(validation_errors[:3]):
-            error_msg += f"\n   • {error}"
+        lines.extend(f"   • {error}" for error in validation_errors[:3])
 
         if error_count > 3:
-            error_msg += f"\n   • ... 还有 {error_count - 3} 个错误"
+            lines.append(f"   • ... 还有 {error_count - 3} 个错误")
 
-        return error_msg
+        return "\n".join(lines)
 
     @staticmethod
     def create_success_message(operation: str, details: Optional[str] = None) -> str:
@@ -1,10 +1,17 @@
 """文件处理工具类 - 统一文件和路径处理逻辑"""
 
-from typing import List, Dict, Set
+from typing import Any, List, Dict, Set
 from pathlib import Path
 import glob
+import json
 from .logger import get_logger
 
+# orjson为可选依赖，导入只尝试一次，未安装时回退到标准库json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = get_logger(__name__)
 
 
@@ -177,6 +184,28 @@ class FileUtils:
             logger.error(f"Failed to create directory {directory}: {e}")
             return False
 
+    @classmethod
+    def write_json(cls, file_path: Path, data: Any) -> None:
+        """
+        将数据以缩进格式写入JSON文件（UTF-8，不转义非ASCII字符）
+
+        安装了orjson时使用其原生编码器，否则回退到标准库json。
+
+        Args:
+            file_path: 文件路径
+            data: 要写入的数据
+        """
+        if orjson is not None:
+            try:
+                file_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+                return
+            except TypeError:
+                # orjson不支持的数据类型（如非字符串键），交给标准库处理
+                pass
+
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
     @classmethod
     def get_file_stats(cls, files: List[Path]) -> Dict[str, int]:
         """
@@ -198,20 +227,22 @@ class FileUtils:
         total_size = 0
 
         for file_path in files:
-            if file_path.exists():
-                # 文件大小
+            # 单次 stat 同时完成存在性检查与大小读取
+            try:
                 size = file_path.stat().st_size
-                total_size += size
-
-                # 按扩展名统计
-                ext = file_path.suffix.lower()
-                stats["by_extension"][ext] = stats["by_extension"].get(ext, 0) + 1
-
-                # 按目录统计
-                directory = str(file_path.parent)
-                stats["by_directory"][directory] = (
-                    stats["by_directory"].get(directory, 0) + 1
-                )
+            except OSError:
+                continue
+            total_size += size
+
+            # 按扩展名统计
+            ext = file_path.suffix.lower()
+            stats["by_extension"][ext] = stats["by_extension"].get(ext, 0) + 1
+
+            # 按目录统计
+            directory = str(file_path.parent)
+            stats["by_directory"][directory] = (
+                stats["by_directory"].get(directory, 0) + 1
+            )
 
         stats["total_size_mb"] = round(total_size / (1024 * 1024), 2)
 
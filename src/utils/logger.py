@@ -4,6 +4,22 @@ import logging
 import sys
 from typing import Optional
 
+# 后台线程名称前缀，这些线程只输出警告及以上级别的日志，避免打断前台交互界面
+BACKGROUND_THREAD_PREFIX = "background-"
+
+
+class _BackgroundLogFilter(logging.Filter):
+    """过滤后台线程输出的普通日志"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return (
+            not (record.threadName or "").startswith(BACKGROUND_THREAD_PREFIX)
+            or record.levelno >= logging.WARNING
+        )
+
+
+_background_log_filter = _BackgroundLogFilter()
+
 
 def get_logger(name: str, level: str = "INFO") -> logging.Logger:
     """获取配置好的日志记录器
@@ -17,8 +33,10 @@ def get_logger(name: str, level: str = "INFO") -> logging.Logger:
     """
     logger = logging.getLogger(name)
 
-    # 设置日志级别
-    logger.setLevel(getattr(logging, level.upper()))
+    # 设置日志级别（级别未变化时跳过，setLevel 会清空所有日志器的级别缓存）
+    level_value = getattr(logging, level.upper())
+    if logger.level != level_value:
+        logger.setLevel(level_value)
 
     # 不添加处理器，让日志器继承根日志器的配置
     return logger
@@ -30,9 +48,16 @@ def setup_logging(level: str = "INFO") -> None:
     Args:
         level: 日志级别
     """
+    # 根日志器已配置过处理器时 basicConfig 不会生效，直接返回，不再重复创建处理器
+    if logging.getLogger().handlers:
+        return
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.addFilter(_background_log_filter)
+
     logging.basicConfig(
         level=getattr(logging, level.upper()),
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
-        handlers=[logging.StreamHandler(sys.stdout)],
+        handlers=[handler],
     )
@@ -1,9 +1,10 @@
 """共享的歌曲管理服务 - 单例模式"""
 
+import threading
 from typing import Optional
 from pathlib import Path
 from ..data.songs.song_manager import SongManager
-from .logger import get_logger
+from .logger import get_logger, BACKGROUND_THREAD_PREFIX
 
 logger = get_logger(__name__)
 
@@ -13,6 +14,9 @@ class SongService:
 
     _instance: Optional["SongService"] = None
     _song_manager: Optional[SongManager] = None
+    _initialized: bool = False
+    # 保护SongManager的创建，后台预加载与前台获取不会重复扫描乐曲目录
+    _lock = threading.Lock()
 
     def __new__(cls) -> "SongService":
         if cls._instance is None:
@@ -21,7 +25,7 @@ class SongService:
 
     def __init__(self):
         # 避免重复初始化
-        if hasattr(self, "_initialized"):
+        if self._initialized:
             return
         self._initialized = True
         logger.debug("SongService singleton initialized")
@@ -36,22 +40,46 @@ class SongService:
             SongManager实例
         """
         if self._song_manager is None:
-            self._song_manager = SongManager(songs_dir or Path("songs"))
-            logger.info(
-                f"Created SongManager with directory: {songs_dir or Path('songs')}"
-            )
+            with self._lock:
+                if self._song_manager is None:
+                    directory = songs_dir or Path("songs")
+                    self._song_manager = SongManager(directory)
+                    logger.info(f"Created SongManager with directory: {directory}")
         return self._song_manager
 
+    def prefetch_song_manager(self, songs_dir: Optional[Path] = None) -> None:
+        """在后台线程中预先创建SongManager，首次获取时无需等待乐曲加载
+
+        Args:
+            songs_dir: 歌曲目录路径
+        """
+        if self._song_manager is None:
+            # 线程名带后台前缀，其普通日志由 setup_logging 的过滤器屏蔽，不会打断前台菜单
+            threading.Thread(
+                target=self.get_song_manager,
+                args=(songs_dir,),
+                name=f"{BACKGROUND_THREAD_PREFIX}song-prefetch",
+                daemon=True,
+            ).start()
+
     def reload_songs(self, songs_dir: Optional[Path] = None) -> SongManager:
         """重新加载歌曲数据
 
+        目录未变化时只增量刷新新增、修改或删除的乐曲文件。
+
         Args:
             songs_dir: 歌曲目录路径
 
         Returns:
-            新的SongManager实例
+            SongManager实例
         """
-        self._song_manager = SongManager(songs_dir or Path("songs"))
+        with self._lock:
+            if self._song_manager is not None and (
+                songs_dir is None or Path(songs_dir) == self._song_manager.songs_dir
+            ):
+                self._song_manager.refresh()
+            else:
+                self._song_manager = SongManager(songs_dir or Path("songs"))
         logger.info("Songs reloaded")
         return self._song_manager
 
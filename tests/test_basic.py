@@ -1,10 +1,40 @@
 """基本功能测试"""
 
+import os
+from time import perf_counter
+from types import SimpleNamespace
+
 import pytest
 from src.core.parser import RelativeParser
 from src.core.converter import AutoConverter
-from src.data.music_theory import MusicNotation, RelativeNote, PhysicalNote
-from src.data.songs.sample_songs import get_sample_songs
+from src.core.flute import AutoFlute
+from src.data.music_theory import (
+    FlutePhysical,
+    MusicNotation,
+    RelativeNote,
+    PhysicalNote,
+)
+from src.config.app_config import AppConfig
+from src.data.songs.sample_songs import Song, get_sample_songs
+from src.data.songs.song_manager import SongManager
+from src.services.song_service_base import SongServiceBase
+from src.ui.song_selector import SongSelector
+from src.ui.ui_factory import UIManagerFactory
+
+
+@pytest.fixture
+def song_service():
+    """提供歌曲服务实例，并在测试前后清空类级别共享的解析/转换缓存"""
+    caches = (
+        SongServiceBase._parse_cache,
+        SongServiceBase._convert_cache,
+        SongServiceBase._analysis_cache,
+    )
+    for cache in caches:
+        cache.clear()
+    yield SongServiceBase(setup_logging_level=False)
+    for cache in caches:
+        cache.clear()
 
 
 def test_relative_note_creation():
@@ -60,6 +90,17 @@ def test_converter_basic():
     assert result[1][0].physical_height == 3.0  # 2.0 + 1.0
     assert result[2][0].physical_height is None  # 休止符不变
 
+    converted, unplayable_count = converter.convert_jianpu_with_stats(
+        notes, strategy="manual", manual_offset=1.0
+    )
+    assert converted == result
+    assert unplayable_count == sum(
+        1
+        for bar in converted
+        for note in bar
+        if note.physical_height is not None and not note.key_combination
+    )
+
 
 def test_sample_songs():
     """测试示例乐曲"""
@@ -121,3 +162,231 @@ def test_parser_supports_hh_notes():
     assert result[0][0].relative_height == MusicNotation.get_relative_height("hh1")
     assert result[0][1].relative_height == MusicNotation.get_relative_height("hh2")
     assert result[0][2].relative_height == MusicNotation.get_relative_height("hh2.5")
+
+
+def test_key_combination_uses_full_mapping():
+    """测试按键组合查询与完整按键映射表一致"""
+    mapping = FlutePhysical._generate_full_key_mapping()
+    for height, keys in mapping.items():
+        assert FlutePhysical.get_key_combination(height) == keys
+    assert FlutePhysical.get_key_combination(100.0) == []
+
+
+def test_song_manager_refresh_reloads_changed_files(tmp_path):
+    """测试增量刷新只处理新增、修改和删除的乐曲文件"""
+    song_file = tmp_path / "test_song.yaml"
+    song_file.write_text("name: Test Song\nbpm: 100\njianpu:\n  - 1 2 3 4\n")
+    manager = SongManager(tmp_path)
+    assert "test_song" in manager.songs
+    assert manager.refresh() == 0
+
+    song_file.write_text("name: Test Song\nbpm: 120\njianpu:\n  - 1 2 3 4\n")
+    os.utime(song_file, (0, 12345))
+    assert manager.refresh() == 1
+    assert manager.songs["test_song"].bpm == 120
+
+    song_file.unlink()
+    assert manager.refresh() == 1
+    assert "test_song" not in manager.songs
+    assert "Test Song" not in manager.name_to_key
+
+
+def test_song_manager_refresh_keeps_song_when_collision_loser_deleted(tmp_path):
+    """测试删除同key冲突中被覆盖的文件后，乐曲仍保留在胜出的文件上"""
+    for stem in ("a", "b"):
+        (tmp_path / f"{stem}.yaml").write_text(
+            "name: Dup\nbpm: 100\njianpu:\n  - 1 2 3 4\n"
+        )
+    manager = SongManager(tmp_path)
+    winner = manager.get_song_path("Dup")
+    loser = tmp_path / ("a.yaml" if winner.name == "b.yaml" else "b.yaml")
+
+    loser.unlink()
+    assert manager.refresh() == 1
+    assert "dup" in manager.songs
+    assert manager.get_song_path("Dup") == winner
+    assert SongManager(tmp_path).get_song_path("Dup") == winner
+
+
+def test_song_manager_refresh_keeps_json_over_yaml_order(tmp_path):
+    """测试刷新后同key冲突仍按完整加载顺序由JSON覆盖YAML"""
+    yaml_file = tmp_path / "dup.yaml"
+    yaml_file.write_text("name: Dup\nbpm: 100\njianpu:\n  - 1 2 3 4\n")
+    json_file = tmp_path / "dup.json"
+    json_file.write_text('{"name": "Dup", "bpm": 90, "jianpu": []}')
+    manager = SongManager(tmp_path)
+    assert manager.songs["dup"].bpm == 90
+
+    yaml_file.write_text("name: Dup\nbpm: 120\njianpu:\n  - 1 2 3 4\n")
+    os.utime(yaml_file, (0, 12345))
+    assert manager.refresh() == 1
+    assert manager.songs["dup"].bpm == 90
+    assert manager.get_song_path("Dup") == json_file
+
+
+def test_song_service_caches_hit_for_same_song(song_service, monkeypatch):
+    """测试同一乐曲对象重复获取时直接命中解析、转换和分析缓存"""
+    song = Song(name="Cache Song", bpm=100, jianpu=[[1, 2, 3, 4], [5, 6, 7, "h1"]])
+    parsed = song_service.get_parsed_jianpu(song)
+    converted = song_service.get_converted_jianpu(song, "high")
+    analysis = song_service.get_song_analysis(song)
+
+    def fail_parse(jianpu):
+        raise AssertionError("cache miss")
+
+    monkeypatch.setattr(song_service.parser, "parse", fail_parse)
+    assert song_service.get_parsed_jianpu(song) is parsed
+    assert song_service.get_converted_jianpu(song, "high") is converted
+    assert song_service.get_song_analysis(song) is analysis
+    # 不同策略使用独立的缓存条目
+    assert song_service.get_converted_jianpu(song, "low") is not converted
+
+
+def test_song_service_cache_evicts_oldest_entry(song_service):
+    """测试缓存超出容量后淘汰最早的条目"""
+    max_size = SongServiceBase._CACHE_MAX_SIZE
+    songs = [
+        Song(name=f"Song {i}", bpm=100, jianpu=[[1, 2, 3]]) for i in range(max_size + 1)
+    ]
+    first_parsed = song_service.get_parsed_jianpu(songs[0])
+    for song in songs[1:]:
+        song_service.get_parsed_jianpu(song)
+
+    cache = SongServiceBase._parse_cache
+    assert len(cache) == max_size
+    assert "Song 0" not in cache
+    assert "Song 1" in cache
+    assert song_service.get_parsed_jianpu(songs[0]) is not first_parsed
+
+
+def test_song_service_cache_invalidated_by_reloaded_song(song_service):
+    """测试重新加载得到同名的新乐曲对象时缓存失效"""
+    song = Song(name="Reloaded", bpm=100, jianpu=[[1, 2, 3, 4]])
+    parsed = song_service.get_parsed_jianpu(song)
+    converted = song_service.get_converted_jianpu(song)
+    analysis = song_service.get_song_analysis(song)
+
+    reloaded = Song(name="Reloaded", bpm=100, jianpu=[[5, 6, 7]])
+    new_parsed = song_service.get_parsed_jianpu(reloaded)
+    assert new_parsed is not parsed
+    assert [n.notation for n in new_parsed[0]] == ["5", "6", "7"]
+    assert song_service.get_converted_jianpu(reloaded) is not converted
+    assert song_service.get_song_analysis(reloaded) is not analysis
+    assert len(song_service.get_converted_jianpu(reloaded)[0][0]) == 3
+
+
+def _make_song_selector():
+    """用固定的乐曲集合构建歌曲选择器"""
+    songs = {
+        "alpha": Song(name="Alpha Song", bpm=120, jianpu=[[1]], description="first"),
+        "beta": Song(name="Beta", bpm=12, jianpu=[[1]], description="has 12a inside"),
+        "gamma": Song(name="Gamma 12abc", bpm=90, jianpu=[[1]]),
+        "delta": Song(name="Delta", bpm=100, jianpu=[[1]]),
+        "epsilon": Song(name="Epsilon", bpm=12, jianpu=[[1]]),
+    }
+    manager = SimpleNamespace(
+        songs=songs,
+        name_to_key={song.name: key for key, song in songs.items()},
+        generation=0,
+    )
+    return SongSelector(manager)
+
+
+def _brute_force_search(selector, query):
+    return {song.name for song in selector.songs if song.matches_search(query)}
+
+
+def test_song_selector_short_query_scans_without_index():
+    """测试少于3个字符的查询不使用三元组索引，结果与逐个匹配一致"""
+    selector = _make_song_selector()
+    results = selector.search_songs("Al")
+    assert {song.name for song in results} == _brute_force_search(selector, "al")
+    assert {song.name for song in results} == {"Alpha Song"}
+    assert selector._trigram_index is None
+
+
+def test_song_selector_digit_query_matches_bpm():
+    """测试纯数字查询按BPM相等匹配（BPM不出现在文本中也能命中）"""
+    selector = _make_song_selector()
+    assert {song.name for song in selector.search_songs("120")} == {"Alpha Song"}
+    assert {song.name for song in selector.search_songs("12")} == {
+        "Beta",
+        "Gamma 12abc",
+        "Epsilon",
+    }
+
+
+def test_song_selector_reuses_cached_digit_prefix(monkeypatch):
+    """测试在已缓存的数字查询结果上过滤时，排除仅因BPM相等而命中的歌曲"""
+    selector = _make_song_selector()
+    selector.search_songs("12")
+
+    def fail_candidates(query):
+        raise AssertionError("prefix result not reused")
+
+    monkeypatch.setattr(selector, "_candidate_indices", fail_candidates)
+    results = selector.search_songs("12a")
+    assert {song.name for song in results} == _brute_force_search(selector, "12a")
+    assert {song.name for song in results} == {"Beta", "Gamma 12abc"}
+
+
+def test_song_selector_missing_trigram_returns_no_candidates():
+    """测试查询包含索引中不存在的三元组时直接判定无匹配"""
+    selector = _make_song_selector()
+    assert selector._candidate_indices("zzz") == []
+    assert selector.search_songs("alpha zzz") == []
+    assert selector.search_songs("alp") == selector.search_songs("ALP ")
+    assert [song.name for song in selector.search_songs("alp")] == ["Alpha Song"]
+
+
+def test_song_selector_search_cache_evicts_least_recent():
+    """测试搜索缓存超过32条后淘汰最久未使用的查询"""
+    selector = _make_song_selector()
+    queries = [f"query {i}" for i in range(selector._search_cache_size)]
+    for query in queries:
+        selector.search_songs(query)
+    # 再次访问最早的查询，使其成为最近使用
+    selector.search_songs(queries[0])
+    selector.search_songs("one more")
+
+    assert len(selector._search_cache) == selector._search_cache_size
+    assert queries[0] in selector._search_cache
+    assert queries[1] not in selector._search_cache
+    assert "one more" in selector._search_cache
+
+
+def test_app_config_set_replaces_equal_value_of_other_type(tmp_path):
+    """测试设置相等但类型不同的值时仍会写入"""
+    config = AppConfig(tmp_path / "config.json")
+    config.set("test", "flag", 1)
+    config.set("test", "flag", True)
+    assert config.get("test", "flag") is True
+    config.set("test", "flag", 1.0)
+    assert type(config.get("test", "flag")) is float
+
+
+def test_flute_wait_until_reaches_deadline_and_honours_stop():
+    """测试等待在目标时间点之后返回，并在请求停止时立即中断"""
+    flute = AutoFlute(keyboard=SimpleNamespace(), quiet=True)
+    target = perf_counter() + 0.05
+    assert flute._wait_until(target) is True
+    assert perf_counter() >= target
+
+    flute.stop_requested = True
+    started = perf_counter()
+    assert flute._wait_until(started + 1.0) is False
+    assert perf_counter() - started < 0.5
+
+
+def test_shared_song_selector_sees_added_song(tmp_path):
+    """测试通过add_song添加乐曲后，复用的歌曲选择器会重新加载"""
+    manager = SongManager(tmp_path)
+    factory = UIManagerFactory()
+    selector = factory.get_song_selector(manager)
+    assert "Added Song" not in {song.name for song in selector.songs}
+
+    generation = manager.generation
+    manager.add_song(Song(name="Added Song", bpm=100, jianpu=[[1, 2, 3]]))
+    assert manager.generation == generation + 1
+    assert factory.get_song_selector(manager) is selector
+    assert "Added Song" in {song.name for song in selector.songs}